@@ -148,7 +148,11 @@ class EmailConfig:
             'sender_email': email_config['email_sender'],
             'auth_code': email_config['auth_code'],
             'use_ssl': email_config.get('use_ssl', False),
-            'use_tls': email_config.get('use_tls', True)
+            'use_tls': email_config.get('use_tls', True),
+            # SMTP连接池：最大连接数、单个连接最多发送的邮件数、连接最长存活秒数
+            'pool_size': int(email_config.get('smtp_pool_size', 5)),
+            'max_messages_per_connection': int(email_config.get('smtp_max_messages', 100)),
+            'max_connection_age': float(email_config.get('smtp_max_age', 300)),
         }
 
     def get_imap_config(self) -> Dict[str, str]:
@@ -165,6 +169,7 @@ class EmailConfig:
             'imap_port': email_config.get('imap_port', '993'),  # QQ邮箱IMAP SSL端口
             'email': email_config['email_sender'],
             'auth_code': email_config['auth_code'],
+            'compress': email_config.get('imap_compress', False),  # COMPRESS=DEFLATE，以 CPU 换带宽
         }
 
     def get_sender_info(self) -> Dict[str, str]:
@@ -53,7 +53,8 @@ def main() -> None:
             print(f"\n[{time.strftime('%Y-%m-%d %H:%M:%S')}] 状态:")
             print(f"  定时任务: {len(jobs)} 个")
             for job in jobs:
-                print(f"    - {job['name']}: 下次运行 {job.get('next_run_time', 'N/A')}")
+                next_run_time = job.get('next_run_time')
+                print(f"    - {job['name']}: 下次运行 {next_run_time.isoformat() if next_run_time else 'N/A'}")
 
             # 邮件监听器正在运行中
 
@@ -8,7 +8,7 @@ from .scheduler_service import (
 from .receive_emails_service import (
     ReceiveEmailsService,
     EmailMessage,
-    receive_emails_service
+    get_receive_emails_service
 )
 from .email_listener import (
     EmailListener,
@@ -32,7 +32,7 @@ __all__ = [
     "scheduler_service",
     "ReceiveEmailsService",
     "EmailMessage",
-    "receive_emails_service",
+    "get_receive_emails_service",
     "EmailListener",
     "ListenerMode",
     "start_email_listener",
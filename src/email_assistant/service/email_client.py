@@ -14,9 +14,14 @@
 - 可复用：供上层服务使用
 """
 
+import base64
 import imaplib
+import io
 import logging
+import re
 import threading
+import zlib
+from functools import wraps
 from typing import Optional, Dict, Any, List, Union
 from contextlib import contextmanager
 from ..config import EmailConfig
@@ -27,6 +32,196 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# RFC 4978：COMPRESS 命令需要在认证后才能使用
+imaplib.Commands.setdefault('COMPRESS', ('AUTH', 'SELECTED'))
+
+
+class _DeflateReader(io.RawIOBase):
+    """
+    COMPRESS=DEFLATE 读通道：从 socket 读取压缩数据并解压
+
+    包装为 BufferedReader 后替换 conn.file，imaplib 的 read/readline 无需改动
+    """
+
+    def __init__(self, sock):
+        self._sock = sock
+        # RFC 4978 使用原始 DEFLATE 流（无 zlib 头）
+        self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+        # 已解压未读出的数据；用 memoryview 切片，读出时不复制剩余部分
+        self._pending = memoryview(b'')
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            data = self._sock.recv(16384)
+            if not data:
+                return 0
+            self._pending = memoryview(self._decompressor.decompress(data))
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def _enable_compression(conn: imaplib.IMAP4_SSL) -> bool:
+    """
+    协商 IMAP COMPRESS=DEFLATE（RFC 4978）并替换连接的读写通道
+
+    Args:
+        conn: 已登录的 IMAP 连接
+
+    Returns:
+        bool: 是否已启用压缩
+    """
+    _, caps = conn.capability()
+    if b'COMPRESS=DEFLATE' not in caps[0]:
+        logger.info("服务器不支持 COMPRESS=DEFLATE，使用未压缩连接")
+        return False
+
+    status, _ = conn._simple_command('COMPRESS', 'DEFLATE')
+    if status != 'OK':
+        logger.warning(f"COMPRESS=DEFLATE 协商失败: {status}")
+        return False
+
+    sock = conn.sock
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+
+    def send(data: bytes) -> None:
+        sock.sendall(compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH))
+
+    conn.file = io.BufferedReader(_DeflateReader(sock))
+    conn.send = send
+    logger.info("已启用 IMAP COMPRESS=DEFLATE 压缩")
+    return True
+
+
+def _synchronized(method):
+    """在连接锁内执行 IMAP 操作，保证同一连接上的命令不会被多线程交错发送"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _encode_mailbox(name: Union[str, bytes]) -> bytes:
+    """
+    将文件夹名编码为 IMAP 线上格式（RFC 3501 修改版 UTF-7，必要时加引号）
+
+    Args:
+        name: 文件夹名称
+
+    Returns:
+        bytes: 可直接作为命令参数发送的文件夹名
+    """
+    if isinstance(name, bytes):
+        return name
+
+    encoded = []
+    pending = ''
+    for ch in name + '\x00':
+        if ch != '\x00' and not (0x20 <= ord(ch) <= 0x7e):
+            pending += ch
+            continue
+        if pending:
+            b64 = base64.b64encode(pending.encode('utf-16-be')).rstrip(b'=').replace(b'/', b',')
+            encoded.append(b'&' + b64 + b'-')
+            pending = ''
+        if ch == '&':
+            encoded.append(b'&-')
+        elif ch != '\x00':
+            encoded.append(ch.encode('ascii'))
+
+    mailbox = b''.join(encoded)
+    if not mailbox or any(c in mailbox for c in b' "(){\\'):
+        mailbox = b'"' + mailbox.replace(b'\\', b'\\\\').replace(b'"', b'\\"') + b'"'
+    return mailbox
+
+
+def _compress_uid_set(msg_ids: List[Union[str, bytes, int]]) -> bytes:
+    """
+    将邮件 ID 列表压缩为 IMAP 序列集（连续编号合并为区间，如 1:5,8,11:14）
+
+    Args:
+        msg_ids: UID 或序号列表
+
+    Returns:
+        bytes: 可直接作为命令参数发送的序列集
+    """
+    raw = [msg_id.decode() if isinstance(msg_id, bytes) else str(msg_id) for msg_id in msg_ids]
+    if not all(msg_id.isdigit() for msg_id in raw):
+        # 已是区间/通配等形式，原样拼接
+        return ','.join(raw).encode('ascii')
+
+    numbers = sorted(set(int(msg_id) for msg_id in raw))
+    ranges = []
+    start = prev = numbers[0]
+    for n in numbers[1:]:
+        if n != prev + 1:
+            ranges.append(f'{start}:{prev}' if start != prev else str(start))
+            start = n
+        prev = n
+    ranges.append(f'{start}:{prev}' if start != prev else str(start))
+    return ','.join(ranges).encode('ascii')
+
+
+def _parse_fetch_response(msg_data: List[Any], uid: bool = False) -> Dict[str, bytes]:
+    """
+    解析多封邮件的 FETCH 响应
+
+    Args:
+        msg_data: imaplib FETCH 返回的数据列表
+        uid: 是否按 UID 取键（响应中需包含 UID 数据项），否则按序号取键
+
+    Returns:
+        Dict[str, bytes]: 邮件 ID -> 原始内容
+    """
+    results = {}
+    # 头部未带 UID 的邮件内容，等待字面量之后的数据项中出现 UID
+    pending = None
+    for item in msg_data:
+        # 每封邮件的响应为 (b'<seq> (UID <uid> BODY[] {n}', raw)，其余为结尾的 b')'；
+        # 数据项顺序由服务器决定，UID 也可能出现在结尾部分，如 b' UID <uid> FLAGS ())'
+        if not isinstance(item, tuple):
+            if pending is not None and isinstance(item, bytes):
+                match = re.search(rb'UID (\d+)', item)
+                if match:
+                    results[match.group(1).decode()] = pending
+                else:
+                    logger.warning("FETCH 响应中缺少 UID，已忽略: %r", item)
+            pending = None
+            continue
+        header = item[0]
+        if uid:
+            match = re.search(rb'UID (\d+)', header)
+            if not match:
+                pending = item[1]
+                continue
+            key = match.group(1).decode()
+        else:
+            key = header.split(None, 1)[0].decode()
+        results[key] = item[1]
+        pending = None
+    return results
+
+
+def _with_uid_item(parts: str) -> str:
+    """
+    为 UID FETCH 的数据项显式加上 UID，避免依赖服务器自动附带
+
+    Args:
+        parts: FETCH 数据项
+
+    Returns:
+        str: 包含 UID 的数据项
+    """
+    if re.search(r'\bUID\b', parts, re.IGNORECASE):
+        return parts
+    return f'UID {parts}'
+
 
 class IMAPClient:
     """
@@ -39,6 +234,9 @@ class IMAPClient:
     - 统一的错误处理
     """
 
+    # 流水线 FETCH 每个窗口内连续发送的命令数
+    PIPELINE_DEPTH = 16
+
     def __init__(self, config_path: Optional[str] = None):
         """
         初始化 IMAP 客户端
@@ -78,6 +276,10 @@ class IMAPClient:
             # 登录
             conn.login(self.imap_config['email'], self.imap_config['auth_code'])
 
+            # 可选：启用压缩（以 CPU 换带宽，默认关闭）
+            if self.imap_config.get('compress'):
+                _enable_compression(conn)
+
             logger.info(f"IMAP 连接创建成功: {self.imap_config['email']}")
             return conn
 
@@ -106,12 +308,21 @@ class IMAPClient:
                     self._connection.noop()
                 except imaplib.IMAP4.error:
                     logger.warning("连接已断开，尝试重新连接...")
-                    self._connection = self._create_connection()
+                    folder = self._current_folder
                     # 重置当前文件夹状态（新连接需要重新 SELECT）
                     self._current_folder = None
+                    self._connection = self._create_connection()
+                    # 在新连接上恢复之前选中的文件夹：调用方可能已跳过 SELECT，
+                    # 直接在此连接上发送 SEARCH/FETCH 等需要 SELECTED 状态的命令
+                    if folder is not None:
+                        status, _ = self._connection.select(folder)
+                        if status == 'OK':
+                            self._current_folder = folder
+                            logger.info(f"重连后已恢复文件夹: {folder}")
 
             return self._connection
 
+    @_synchronized
     def select_folder(self, folder: str = 'INBOX') -> bool:
         """
         选择邮箱文件夹
@@ -128,7 +339,7 @@ class IMAPClient:
         try:
             # 如果已经在该文件夹，直接返回
             if self._current_folder == folder:
-                logger.debug(f"已在文件夹: {folder}，跳过 SELECT")
+                logger.debug("已在文件夹: %s，跳过 SELECT", folder)
                 return True
 
             # 执行 SELECT 命令
@@ -147,10 +358,12 @@ class IMAPClient:
             self._current_folder = None
             raise
 
+    @_synchronized
     def search_emails(
         self,
         criteria: str = 'ALL',
-        folder: str = 'INBOX'
+        folder: str = 'INBOX',
+        uid: bool = False
     ) -> List[bytes]:
         """
         搜索邮件
@@ -158,35 +371,48 @@ class IMAPClient:
         Args:
             criteria: 搜索条件，如 'UNSEEN', 'FROM "example.com"', 'SINCE 1-Jan-2024'
             folder: 文件夹名称
+            uid: 是否使用 UID SEARCH（返回 UID 而不是序号）
 
         Returns:
-            List[bytes]: 邮件 ID 列表
+            List[bytes]: 邮件 ID 列表（uid=True 时为 UID 列表）
 
         Raises:
             Exception: 搜索失败
         """
         try:
             self.select_folder(folder)
-            status, messages = self.connection.search(None, criteria)
+            if uid:
+                status, messages = self.connection.uid('SEARCH', None, criteria)
+            else:
+                status, messages = self.connection.search(None, criteria)
 
             if status != 'OK':
                 raise Exception(f"搜索邮件失败: {status}")
 
             email_ids = messages[0].split()
-            logger.debug(f"搜索到 {len(email_ids)} 封邮件，条件: {criteria}")
+            logger.debug("搜索到 %d 封邮件，条件: %s", len(email_ids), criteria)
             return email_ids
 
         except Exception as e:
             logger.error(f"搜索邮件失败: {str(e)}")
             raise
 
-    def fetch_email(self, msg_id: Union[str, bytes], folder: str = 'INBOX') -> Optional[bytes]:
+    @_synchronized
+    def fetch_email(
+        self,
+        msg_id: Union[str, bytes],
+        folder: str = 'INBOX',
+        parts: str = 'BODY.PEEK[]',
+        uid: bool = False
+    ) -> Optional[bytes]:
         """
         获取单封邮件的原始内容
 
         Args:
             msg_id: 邮件 ID
             folder: 文件夹名称
+            parts: FETCH 数据项，默认 'BODY.PEEK[]'（完整内容，且不会隐式设置 \\Seen）
+            uid: msg_id 是否为 UID（使用 UID FETCH）
 
         Returns:
             Optional[bytes]: 邮件原始内容，如果失败返回 None
@@ -201,9 +427,12 @@ class IMAPClient:
             if isinstance(msg_id, str):
                 msg_id = msg_id.encode()
 
-            status, msg_data = self.connection.fetch(msg_id, '(RFC822)')
+            if uid:
+                status, msg_data = self.connection.uid('FETCH', msg_id, f'({parts})')
+            else:
+                status, msg_data = self.connection.fetch(msg_id, f'({parts})')
 
-            if status != 'OK':
+            if status != 'OK' or not msg_data or not isinstance(msg_data[0], tuple):
                 logger.error(f"获取邮件失败: {msg_id}")
                 return None
 
@@ -213,12 +442,203 @@ class IMAPClient:
             logger.error(f"获取邮件失败: {str(e)}")
             raise
 
+    @_synchronized
+    def fetch_emails(
+        self,
+        msg_ids: List[Union[str, bytes]],
+        folder: str = 'INBOX',
+        parts: str = 'BODY.PEEK[]',
+        uid: bool = False
+    ) -> Dict[str, bytes]:
+        """
+        一次 FETCH 批量获取多封邮件的原始内容
+
+        Args:
+            msg_ids: 邮件 ID 列表
+            folder: 文件夹名称
+            parts: FETCH 数据项，默认 'BODY.PEEK[]'
+            uid: msg_ids 是否为 UID（使用 UID FETCH）
+
+        Returns:
+            Dict[str, bytes]: 邮件 ID -> 原始内容（获取失败的邮件不在结果中）
+
+        Raises:
+            Exception: 获取邮件失败
+        """
+        if not msg_ids:
+            return {}
+
+        try:
+            self.select_folder(folder)
+
+            message_set = _compress_uid_set(msg_ids)
+
+            if uid:
+                status, msg_data = self.connection.uid('FETCH', message_set, f'({_with_uid_item(parts)})')
+            else:
+                status, msg_data = self.connection.fetch(message_set, f'({parts})')
+
+            if status != 'OK':
+                logger.error(f"批量获取邮件失败: {status}")
+                return {}
+
+            results = _parse_fetch_response(msg_data, uid=uid)
+
+            logger.debug("批量获取 %d/%d 封邮件", len(results), len(msg_ids))
+            return results
+
+        except Exception as e:
+            logger.error(f"批量获取邮件失败: {str(e)}")
+            raise
+
+    @_synchronized
+    def fetch_emails_pipelined(
+        self,
+        msg_ids: List[Union[str, bytes]],
+        folder: str = 'INBOX',
+        parts: str = 'BODY.PEEK[]',
+        uid: bool = False
+    ) -> Dict[str, bytes]:
+        """
+        流水线获取多封邮件（RFC 3501 §5.5）：连续发送多条 FETCH，再按 tag 依次收取结果
+
+        适用于不接受大序列集的服务器；每个窗口只有一次往返等待。
+
+        Args:
+            msg_ids: 邮件 ID 列表
+            folder: 文件夹名称
+            parts: FETCH 数据项，默认 'BODY.PEEK[]'
+            uid: msg_ids 是否为 UID（使用 UID FETCH）
+
+        Returns:
+            Dict[str, bytes]: 邮件 ID -> 原始内容（获取失败的邮件不在结果中）
+
+        Raises:
+            Exception: 连接异常
+        """
+        if not msg_ids:
+            return {}
+
+        try:
+            self.select_folder(folder)
+
+            conn = self.connection
+            command = ('UID', 'FETCH') if uid else ('FETCH',)
+            parts_arg = f'({_with_uid_item(parts) if uid else parts})'
+            results = {}
+
+            for start in range(0, len(msg_ids), self.PIPELINE_DEPTH):
+                window = msg_ids[start:start + self.PIPELINE_DEPTH]
+
+                # 先连续发送整个窗口的命令，不等待响应
+                tags = [
+                    conn._command(*command, msg_id.encode() if isinstance(msg_id, str) else msg_id, parts_arg)
+                    for msg_id in window
+                ]
+
+                # 再按 tag 收取完成响应；未标记的 FETCH 数据由 imaplib 汇总到 untagged_responses
+                for tag in tags:
+                    try:
+                        status, _ = conn._command_complete(command[0], tag)
+                        if status != 'OK':
+                            logger.warning(f"流水线获取邮件失败: {tag.decode()} {status}")
+                    except conn.abort:
+                        raise
+                    except conn.error as e:
+                        logger.warning(f"流水线获取邮件失败: {str(e)}")
+
+                _, msg_data = conn._untagged_response('OK', [None], 'FETCH')
+                results.update(_parse_fetch_response(msg_data, uid=uid))
+
+            logger.debug("流水线获取 %d/%d 封邮件", len(results), len(msg_ids))
+            return results
+
+        except Exception as e:
+            logger.error(f"流水线获取邮件失败: {str(e)}")
+            raise
+
+    def fetch_headers(self, msg_id: Union[str, bytes], folder: str = 'INBOX') -> Optional[bytes]:
+        """
+        只获取邮件头（不下载正文和附件）
+
+        返回的字节可直接交给 email.parser.BytesHeaderParser 解析。
+
+        Args:
+            msg_id: 邮件 ID
+            folder: 文件夹名称
+
+        Returns:
+            Optional[bytes]: 邮件头原始内容，如果失败返回 None
+        """
+        return self.fetch_email(msg_id, folder=folder, parts='BODY.PEEK[HEADER]')
+
+    def fetch_headers_bulk(
+        self,
+        msg_ids: List[Union[str, bytes]],
+        folder: str = 'INBOX',
+        uid: bool = False
+    ) -> Dict[str, bytes]:
+        """
+        一次 FETCH 批量获取多封邮件的邮件头（不下载正文和附件）
+
+        Args:
+            msg_ids: 邮件 ID 列表
+            folder: 文件夹名称
+            uid: msg_ids 是否为 UID（使用 UID FETCH）
+
+        Returns:
+            Dict[str, bytes]: 邮件 ID -> 邮件头原始内容
+        """
+        return self.fetch_emails(msg_ids, folder=folder, parts='BODY.PEEK[HEADER]', uid=uid)
+
+    @_synchronized
+    def fetch_envelope(self, msg_id: Union[str, bytes], folder: str = 'INBOX') -> Optional[bytes]:
+        """
+        获取服务器解析好的 ENVELOPE 结构（日期、主题、发件人、收件人等）
+
+        Args:
+            msg_id: 邮件 ID
+            folder: 文件夹名称
+
+        Returns:
+            Optional[bytes]: ENVELOPE 响应原文，如果失败返回 None
+
+        Raises:
+            Exception: 获取失败
+        """
+        try:
+            self.select_folder(folder)
+
+            if isinstance(msg_id, str):
+                msg_id = msg_id.encode()
+
+            status, msg_data = self.connection.fetch(msg_id, '(ENVELOPE)')
+
+            if status != 'OK' or not msg_data or msg_data[0] is None:
+                logger.error(f"获取邮件 ENVELOPE 失败: {msg_id}")
+                return None
+
+            # ENVELOPE 中含字面量（{n}）时 imaplib 会返回 tuple，拼接还原完整响应
+            envelope = b''
+            for item in msg_data:
+                if isinstance(item, tuple):
+                    envelope += item[0] + item[1]
+                elif item:
+                    envelope += item
+            return envelope
+
+        except Exception as e:
+            logger.error(f"获取邮件 ENVELOPE 失败: {str(e)}")
+            raise
+
+    @_synchronized
     def store_flags(
         self,
         msg_ids: Union[str, bytes, List[Union[str, bytes]]],
         flag_command: str,
         flags: str,
-        folder: str = 'INBOX'
+        folder: str = 'INBOX',
+        uid: bool = False
     ) -> Dict[str, Any]:
         """
         设置邮件标志（已读、删除、星标等）
@@ -228,6 +648,7 @@ class IMAPClient:
             flag_command: 标志命令，如 '+FLAGS'（添加）, '-FLAGS'（移除）, 'FLAGS'（设置）
             flags: 标志值，如 '\\Seen'（已读）, '\\Deleted'（删除）, '\\Flagged'（星标）
             folder: 文件夹名称
+            uid: msg_ids 是否为 UID（使用 UID STORE）
 
         Returns:
             Dict: 操作结果
@@ -241,20 +662,27 @@ class IMAPClient:
             # 统一处理 msg_ids 为列表
             if isinstance(msg_ids, (str, bytes)):
                 msg_ids = [msg_ids]
+            if not msg_ids:
+                return {'success': True, 'count': 0, 'msg_ids': [], 'message': '没有需要设置标志的邮件'}
 
-            results = []
-            for msg_id in msg_ids:
-                # 确保是 bytes 类型
-                if isinstance(msg_id, str):
-                    msg_id = msg_id.encode()
+            # 命令参数编码一次（imaplib.store 不接受 bytes 形式的 flags，直接走 STORE 命令）
+            flag_command_b = flag_command.encode('ascii') if isinstance(flag_command, str) else flag_command
+            flags_b = flags.encode('ascii') if isinstance(flags, str) else flags
+            if not (flags_b.startswith(b'(') and flags_b.endswith(b')')):
+                flags_b = b'(' + flags_b + b')'
 
-                status, response = self.connection.store(msg_id, flag_command, flags)
+            command = ('UID', 'STORE') if uid else ('STORE',)
 
-                if status == 'OK':
-                    results.append(msg_id.decode() if isinstance(msg_id, bytes) else msg_id)
-                    logger.debug(f"邮件 {msg_id} 设置标志成功: {flag_command} {flags}")
-                else:
-                    logger.warning(f"邮件 {msg_id} 设置标志失败: {status}")
+            # 所有邮件合并为一个序列集，一条 STORE 命令完成（N 次往返 → 1 次）
+            message_set = _compress_uid_set(msg_ids)
+            status, response = self.connection._simple_command(*command, message_set, flag_command_b, flags_b)
+
+            if status == 'OK':
+                results = [msg_id.decode() if isinstance(msg_id, bytes) else msg_id for msg_id in msg_ids]
+                logger.debug("邮件 %s 设置标志成功: %s %s", message_set, flag_command, flags)
+            else:
+                results = []
+                logger.warning(f"邮件 {message_set.decode()} 设置标志失败: {status}")
 
             return {
                 'success': True,
@@ -271,6 +699,7 @@ class IMAPClient:
                 'message': f'设置邮件标志失败: {str(e)}'
             }
 
+    @_synchronized
     def copy_email(
         self,
         msg_ids: Union[str, bytes, List[Union[str, bytes]]],
@@ -293,19 +722,22 @@ class IMAPClient:
 
             if isinstance(msg_ids, (str, bytes)):
                 msg_ids = [msg_ids]
+            if not msg_ids:
+                return {'success': True, 'count': 0, 'msg_ids': [], 'message': '没有需要复制的邮件'}
 
-            results = []
-            for msg_id in msg_ids:
-                if isinstance(msg_id, str):
-                    msg_id = msg_id.encode()
+            # 目标文件夹编码一次（支持非 ASCII 文件夹名）
+            dest_folder_b = _encode_mailbox(dest_folder)
 
-                status, response = self.connection.copy(msg_id, dest_folder)
+            # 所有邮件合并为一个序列集，一条 COPY 命令完成
+            message_set = _compress_uid_set(msg_ids)
+            status, response = self.connection.copy(message_set, dest_folder_b)
 
-                if status == 'OK':
-                    results.append(msg_id.decode() if isinstance(msg_id, bytes) else msg_id)
-                    logger.debug(f"邮件 {msg_id} 复制到 {dest_folder} 成功")
-                else:
-                    logger.warning(f"邮件 {msg_id} 复制失败: {status}")
+            if status == 'OK':
+                results = [msg_id.decode() if isinstance(msg_id, bytes) else msg_id for msg_id in msg_ids]
+                logger.debug("邮件 %s 复制到 %s 成功", message_set, dest_folder)
+            else:
+                results = []
+                logger.warning(f"邮件 {message_set.decode()} 复制失败: {status}")
 
             return {
                 'success': True,
@@ -322,6 +754,7 @@ class IMAPClient:
                 'message': f'复制邮件失败: {str(e)}'
             }
 
+    @_synchronized
     def move_email(
         self,
         msg_ids: Union[str, bytes, List[Union[str, bytes]]],
@@ -373,6 +806,7 @@ class IMAPClient:
                 'message': f'移动邮件失败: {str(e)}'
             }
 
+    @_synchronized
     def get_mailbox_status(self, folder: str = 'INBOX') -> Dict[str, Any]:
         """
         获取邮箱状态信息
@@ -394,7 +828,6 @@ class IMAPClient:
                 raise Exception(f"获取邮箱状态失败: {status}")
 
             # 解析状态数据
-            import re
             status_str = data[0].decode()
             messages = int(re.search(r'MESSAGES (\d+)', status_str).group(1))
             unseen = int(re.search(r'UNSEEN (\d+)', status_str).group(1))
@@ -415,6 +848,7 @@ class IMAPClient:
                 'message': f'获取邮箱状态失败: {str(e)}'
             }
 
+    @_synchronized
     def list_folders(self) -> Dict[str, Any]:
         """
         列出所有邮箱文件夹
@@ -7,9 +7,14 @@
 import threading
 import time
 import logging
+import queue
+import re
+import select
 import socket
 import imaplib
-from typing import Callable, Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple
+from collections import OrderedDict
+from contextlib import contextmanager
 from enum import Enum
 from concurrent.futures import ThreadPoolExecutor, Future
 from .receive_emails_service import EmailMessage, ReceiveEmailsService
@@ -22,6 +27,220 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# IDLE 新邮件信号与 DONE 命令（模块级常量，避免在读循环中重复创建）
+_IDLE_SIGNAL = re.compile(rb'\b(?:EXISTS|RECENT)\b')
+_DONE = b'DONE\r\n'
+
+
+def _wait_readable(imap: imaplib.IMAP4, timeout: float) -> bool:
+    """
+    等待 IMAP 连接在 timeout 秒内有数据可读
+
+    用 select 等待而不是依赖 socket 读超时：socket.makefile 得到的文件对象一旦读超时，
+    之后的每次读取都会抛出 OSError，连接只能重建。调用前需通过 _unbuffer_reader 去掉
+    Python 层读缓冲，SSL 层已解密但未读取的数据用 pending() 检查。
+
+    Args:
+        imap: IMAP 连接
+        timeout: 最长等待秒数
+
+    Returns:
+        bool: 是否有数据可读
+    """
+    sock = imap.sock
+    pending = getattr(sock, 'pending', None)
+    if pending is not None and pending():
+        return True
+    readable, _, _ = select.select([sock], [], [], timeout)
+    return bool(readable)
+
+
+def _unbuffer_reader(imap: imaplib.IMAP4) -> None:
+    """
+    将 IMAP 连接的读取文件替换为无缓冲版本
+
+    带缓冲的文件可能已把后续数据读入缓冲区，select 无法感知，会导致 _wait_readable 误判；
+    IDLE 连接上的数据量很小，逐字节读取的开销可以忽略。需在没有未读响应时调用（如登录之后）。
+    """
+    imap.file = imap.sock.makefile('rb', buffering=0)
+
+
+def _enable_tcp_keepalive(sock: socket.socket) -> None:
+    """
+    开启 TCP keepalive，让内核在几十秒内发现已断开的连接（不支持的选项自动跳过）
+
+    Args:
+        sock: IMAP 连接的 socket
+    """
+    options = [
+        (socket.SOL_SOCKET, 'SO_KEEPALIVE', 1),
+        (socket.IPPROTO_TCP, 'TCP_KEEPIDLE', 60),       # 空闲 60 秒后开始探测
+        (socket.IPPROTO_TCP, 'TCP_KEEPINTVL', 15),      # 每 15 秒探测一次
+        (socket.IPPROTO_TCP, 'TCP_KEEPCNT', 4),         # 连续 4 次无响应判定断开
+        (socket.IPPROTO_TCP, 'TCP_USER_TIMEOUT', 30000),  # 未确认数据最多等待 30 秒
+    ]
+    for level, name, value in options:
+        if not hasattr(socket, name):
+            continue
+        try:
+            sock.setsockopt(level, getattr(socket, name), value)
+        except OSError as e:
+            logger.debug(f"设置 {name} 失败: {e}")
+
+
+class _ReceiveServicePool:
+    """
+    ReceiveEmailsService 有界连接池
+
+    - 最多同时存在 max_size 个服务实例（每个实例持有一条 IMAP 连接）
+    - 空闲实例按后进先出复用，最近用过的连接最可能仍然有效
+    - 使用中抛出 IMAP/socket 异常的实例会被关闭丢弃，不再放回池中
+    - 连接有效性由 IMAPClient.connection 在下次使用时通过 NOOP 检查
+    """
+
+    def __init__(self, config_path: Optional[str] = None, max_size: int = 2):
+        self.config_path = config_path
+        self.max_size = max_size
+        self._idle: "queue.LifoQueue[ReceiveEmailsService]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._size = 0
+        self.created = 0
+        self.reused = 0
+
+    @property
+    def size(self) -> int:
+        """当前存在的服务实例数（空闲 + 使用中）"""
+        return self._size
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        借出一个服务实例，退出上下文时自动归还
+
+        Args:
+            timeout: 池已满时等待空闲实例的秒数，None 表示一直等待
+
+        Raises:
+            queue.Empty: 等待超时
+        """
+        service = self._checkout(timeout)
+        healthy = True
+        try:
+            yield service
+        except (imaplib.IMAP4.error, OSError):
+            healthy = False
+            raise
+        finally:
+            self.release(service, healthy)
+
+    def _checkout(self, timeout: Optional[float]) -> ReceiveEmailsService:
+        try:
+            service = self._idle.get_nowait()
+            with self._lock:
+                self.reused += 1
+            return service
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._size < self.max_size
+            if can_create:
+                self._size += 1
+
+        if not can_create:
+            service = self._idle.get(timeout=timeout)
+            with self._lock:
+                self.reused += 1
+            return service
+
+        try:
+            service = ReceiveEmailsService(self.config_path)
+        except Exception:
+            with self._lock:
+                self._size -= 1
+            raise
+
+        with self._lock:
+            self.created += 1
+        logger.info(f"✓ IMAP 连接池新建连接（当前 {self._size}/{self.max_size}）")
+        return service
+
+    def release(self, service: ReceiveEmailsService, healthy: bool = True) -> None:
+        """
+        归还服务实例
+
+        Args:
+            service: 借出的服务实例
+            healthy: 连接是否正常，不正常时关闭并丢弃
+        """
+        if healthy:
+            self._idle.put(service)
+            return
+
+        try:
+            service.close()
+        except Exception as e:
+            logger.warning(f"关闭失效连接时出错: {str(e)}")
+        with self._lock:
+            self._size -= 1
+        logger.info("已丢弃失效的 IMAP 连接，下次使用时重建")
+
+    def close(self) -> None:
+        """关闭所有空闲连接（使用中的连接归还后仍可继续使用）"""
+        while True:
+            try:
+                service = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                service.close()
+            except Exception as e:
+                logger.warning(f"关闭连接时出错: {str(e)}")
+            with self._lock:
+                self._size -= 1
+
+
+# 按 (IMAP 服务器, 邮箱) 共享的连接池
+_service_pools: Dict[Tuple[str, str], _ReceiveServicePool] = {}
+_service_pools_lock = threading.Lock()
+
+
+def _get_service_pool(imap_client: IMAPClient) -> _ReceiveServicePool:
+    """获取（或创建）与 imap_client 账号对应的连接池"""
+    imap_config = imap_client.imap_config
+    key = (imap_config['imap_server'], imap_config['email'])
+    with _service_pools_lock:
+        pool = _service_pools.get(key)
+        if pool is None:
+            pool = _ReceiveServicePool(config_path=imap_client.email_config.config_path)
+            _service_pools[key] = pool
+        return pool
+
+
+# 所有监听实例共享的线程池（按用途和线程数区分），账号增多时线程数不再线性增长
+_shared_executors: Dict[Tuple[str, int], ThreadPoolExecutor] = {}
+_shared_executors_lock = threading.Lock()
+
+
+def _get_shared_executor(name: str, max_workers: int) -> ThreadPoolExecutor:
+    """
+    获取（或创建）共享线程池
+
+    Args:
+        name: 线程名前缀，同时用于区分用途
+        max_workers: 最大工作线程数
+
+    Returns:
+        ThreadPoolExecutor: 共享线程池（进程退出时由解释器回收，不应单独 shutdown）
+    """
+    key = (name, max_workers)
+    with _shared_executors_lock:
+        executor = _shared_executors.get(key)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+            _shared_executors[key] = executor
+        return executor
+
 
 class ListenerMode(Enum):
     """监听模式"""
@@ -41,6 +260,23 @@ class EmailListener:
     4. 在独立线程中运行
     """
 
+    # 新邮件合并批次：单批最多邮件数 / 首封入队后最多等待秒数
+    BATCH_MAX_SIZE = 32
+    BATCH_MAX_WAIT = 0.05
+
+    # 在途回调任务上限 = max_workers * SUBMIT_QUEUE_FACTOR；超过后等待 SUBMIT_TIMEOUT 秒
+    SUBMIT_QUEUE_FACTOR = 4
+    SUBMIT_TIMEOUT = 2.0
+
+    # 最近已处理 UID 的去重窗口大小
+    SEEN_MAX = 4096
+
+    # RFC 2177：IDLE 最长有效 29 分钟，需在此之前重新发送 IDLE 续期
+    IDLE_REARM_INTERVAL = 27 * 60
+
+    # select 判定可读之后读取一行的超时；只有服务器中途停止发送时才会触发，触发后重建连接
+    IDLE_READ_TIMEOUT = 30
+
     def __init__(
         self,
         new_email_callback: Callable[[List[EmailMessage]], None],
@@ -73,31 +309,71 @@ class EmailListener:
         # 使用 IMAPClient 管理连接
         self._imap_client = imap_client if imap_client else IMAPClient()
 
-        # 持久化连接的邮件服务（连接复用）
-        self._receive_service: Optional[ReceiveEmailsService] = None
+        # 邮件服务连接池（按账号共享，有界复用）
+        self._pool = _get_service_pool(self._imap_client)
 
         # 状态
         self.mode = ListenerMode.STOPPED
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._last_uid: Optional[str] = None
+        # 最近已分发的 UID（有界 LRU），防止标记已读完成前的重复分发
+        self._seen_uids: "OrderedDict[str, None]" = OrderedDict()
+        # 停止信号（等待中的线程可立即被唤醒）与线程启动信号
+        self._stop_event = threading.Event()
+        self._started_event = threading.Event()
 
-        # 线程池（用于异步处理邮件）
+        # 线程池（用于异步处理邮件，多个监听实例共享）
         self._executor: Optional[ThreadPoolExecutor] = None
-        self._pending_futures: List[Future] = []
-
-        # 统计
+        # 解析线程池（与回调线程池分开，避免解析排在耗时的回调任务之后）
+        self._parse_executor: Optional[ThreadPoolExecutor] = None
+        # 本实例提交的任务全部完成时置位（线程池共享，stop() 只等待自己的任务）
+        self._tasks_done = threading.Event()
+        self._tasks_done.set()
+        # 在途任务信号量（背压：回调处理跟不上时暂停提交，避免任务队列无限增长）
+        self._submit_sem = threading.BoundedSemaphore(self.max_workers * self.SUBMIT_QUEUE_FACTOR)
+
+        # 新邮件合并队列（突发到达的邮件合并为一次 STORE + 一次回调）
+        self._pending_queue: "queue.Queue[EmailMessage]" = queue.Queue()
+        self._drainer_thread: Optional[threading.Thread] = None
+
+        # 统计（监听线程、合并线程、工作线程都会更新，读写均需持有 _stats_lock）
+        self._stats_lock = threading.Lock()
         self._stats = {
             'total_received': 0,
             'idle_failures': 0,
             'polling_count': 0,
             'mode_switches': 0,
             'processing_tasks': 0,  # 当前正在处理的任务数
-            'completed_tasks': 0,    # 已完成的任务数
-            'connection_reuses': 0,  # 连接复用次数（新增）
-            'connection_restarts': 0 # 连接重建次数（新增）
+            'completed_tasks': 0     # 已完成的任务数
         }
 
+    @property
+    def mode(self) -> ListenerMode:
+        """当前监听模式"""
+        return self._mode
+
+    @mode.setter
+    def mode(self, mode: ListenerMode) -> None:
+        # 同时缓存字符串值，状态查询和日志直接读取，无需每次经过 Enum 描述符
+        self._mode = mode
+        self._mode_str = mode.value
+
+    def _incr_stat(self, key: str, amount: int = 1) -> int:
+        """
+        原子地累加统计计数
+
+        Args:
+            key: 统计项名称
+            amount: 增量，可为负数
+
+        Returns:
+            int: 累加后的值
+        """
+        with self._stats_lock:
+            self._stats[key] += amount
+            return self._stats[key]
+
     def start(self, initial_sync_count: int = 30) -> bool:
         """
         启动邮件监听服务（连接复用优化版）
@@ -108,42 +384,37 @@ class EmailListener:
 
         logger.info("正在启动邮件监听服务...")
 
-        # 初始化线程池
-        self._executor = ThreadPoolExecutor(
-            max_workers=self.max_workers,
-            thread_name_prefix="EmailProcessor"
-        )
-        logger.info(f"线程池已初始化，最大工作线程: {self.max_workers}")
-
-        # ✅ 优化：立即初始化持久化连接（连接复用）
-        if self._receive_service is None:
-            self._receive_service = ReceiveEmailsService()
-            self._stats['connection_restarts'] += 1
-            logger.info("✓ IMAP 长连接已建立（启动时初始化）")
+        # 获取共享线程池
+        self._executor = _get_shared_executor("EmailProcessor", self.max_workers)
+        self._parse_executor = _get_shared_executor("EmailParser", self.max_workers)
+        logger.info(f"线程池已就绪，最大工作线程: {self.max_workers}")
 
-        # 使用持久化连接同步最近的邮件
+        # 使用连接池同步最近的邮件（失效的连接由连接池丢弃，下次轮询时重建）
         try:
-            result = self._receive_service.receive_latest_emails(count=initial_sync_count)
+            with self._pool.acquire() as service:
+                result = service.receive_latest_emails(count=initial_sync_count)
 
-            if result['success'] and result['emails']:
-                logger.info(f"已同步 {len(result['emails'])} 封最近邮件")
+                if result['success'] and result['emails']:
+                    logger.info(f"已同步 {len(result['emails'])} 封最近邮件")
 
-                if result['emails']:
-                    self._last_uid = result['emails'][0].msg_id
-                    logger.info(f"最新邮件 UID: {self._last_uid}")
+                # 记录当前最新邮件的 UID，之后只向服务器查询比它更新的邮件
+                self._last_uid = self._latest_uid(service)
+                logger.info(f"最新邮件 UID: {self._last_uid}")
         except Exception as e:
             logger.error(f"初始同步失败: {str(e)}")
-            # 如果初始同步失败，关闭连接，下次轮询时会重新建立
-            if self._receive_service:
-                try:
-                    self._receive_service.client.close()
-                except:
-                    pass
-                self._receive_service = None
             # 初始失败不影响后续监听
 
         # 启动监听线程
         self._running = True
+        self._stop_event.clear()
+        self._started_event.clear()
+        self._drainer_thread = threading.Thread(
+            target=self._drain_pending_emails,
+            name="EmailBatchDrainer",
+            daemon=True
+        )
+        self._drainer_thread.start()
+
         #self.mode = ListenerMode.IDLE
         self.mode = ListenerMode.POLLING
         self._thread = threading.Thread(
@@ -154,10 +425,9 @@ class EmailListener:
         self._thread.start()
 
         # 等待线程启动
-        import time
-        time.sleep(0.5)  # 短暂等待线程启动
+        self._started_event.wait(timeout=0.5)
 
-        logger.info(f"邮件监听服务已启动，模式: {self.mode.value}")
+        logger.info("邮件监听服务已启动，模式: %s", self._mode_str)
     
 
 
@@ -169,28 +439,30 @@ class EmailListener:
 
         logger.info("正在停止邮件监听服务...")
         self._running = False
+        self._stop_event.set()
+
+        # 等待合并队列中剩余邮件提交到线程池
+        if self._drainer_thread and self._drainer_thread.is_alive():
+            self._drainer_thread.join(timeout=5)
 
-        # 关闭线程池（等待现有任务完成）
+        # 等待本实例提交的任务完成（线程池由所有监听实例共享，不在这里关闭）
         if self._executor:
             logger.info("正在等待邮件处理任务完成...")
-            pending_count = len(self._pending_futures)
+            with self._stats_lock:
+                pending_count = self._stats['processing_tasks']
             if pending_count > 0:
                 logger.info(f"当前有 {pending_count} 个任务在处理中...")
 
-            # 关闭线程池，不再接受新任务
-            self._executor.shutdown(wait=True, timeout=30)
-            logger.info("线程池已关闭")
+            if not self._tasks_done.wait(timeout=30):
+                logger.warning("等待邮件处理任务超时，剩余任务将在后台继续执行")
+            self._executor = None
+            self._parse_executor = None
+            logger.info("已停止向线程池提交任务")
 
-        # 关闭持久化的 IMAP 连接（连接复用版本）
-        if self._receive_service:
-            try:
-                logger.info("正在关闭持久化 IMAP 连接...")
-                self._receive_service.client.close()
-                logger.info("✓ 持久化 IMAP 连接已关闭")
-            except Exception as e:
-                logger.warning(f"关闭持久化连接时出错: {str(e)}")
-            finally:
-                self._receive_service = None
+        # 关闭连接池中的 IMAP 连接
+        logger.info("正在关闭 IMAP 连接池...")
+        self._pool.close()
+        logger.info("✓ IMAP 连接池已关闭")
 
         # 使用 IMAPClient 关闭连接（作为备份）
         self._imap_client.close()
@@ -204,6 +476,7 @@ class EmailListener:
 
     def _run_listener(self) -> None:
         """监听线程主循环"""
+        self._started_event.set()
         logger.info("监听线程已启动")
 
         retry_count = 0
@@ -211,7 +484,7 @@ class EmailListener:
 
         while self._running:
             try:
-                logger.info(f"监听循环开始，当前模式: {self.mode}, 重试计数: {retry_count}")
+                logger.info("监听循环开始，当前模式: %s, 重试计数: %d", self._mode_str, retry_count)
                 
                 # 优先尝试 IDLE 模式
                 # if self.mode != ListenerMode.IDLE and retry_count < self.max_retries:
@@ -224,7 +497,7 @@ class EmailListener:
                 #         retry_count += 1
                 #         logger.warning(f"IDLE 模式失败，尝试轮询模式 ({retry_count}/{self.max_retries})")
                 #         self.mode = ListenerMode.POLLING
-                #         self._stats['mode_switches'] += 1
+                #         self._incr_stat('mode_switches')
 
                 # # IDLE 失败或已达最大重试次数，使用轮询模式
                 # if self.mode == ListenerMode.POLLING or retry_count >= self.max_retries:
@@ -247,13 +520,13 @@ class EmailListener:
                 #     logger.warning(f"IDLE 模式失败，尝试轮询模式 ({retry_count}/{self.max_retries})")
                 #     print(f"IDLE 模式失败，尝试轮询模式 ({retry_count}/{self.max_retries})")
                 #     self.mode = ListenerMode.POLLING
-                #     self._stats['mode_switches'] += 1
+                #     self._incr_stat('mode_switches')
 
             except Exception as e:
                 last_exception = e
                 logger.error(f"监听线程异常: {str(e)}", exc_info=True)  # 添加堆栈信息
                 retry_count += 1
-                time.sleep(5)  # 异常后等待5秒
+                self._stop_event.wait(5)  # 异常后等待5秒（停止时立即返回）
 
         logger.info(f"监听线程已退出，最后异常: {last_exception}")
 
@@ -267,6 +540,7 @@ class EmailListener:
         备注：此模式不稳定，暂不启用
         """
         imap = None
+        tag = None
         try:
             # 1. 创建独立连接（不使用 connection 属性，避免自动重连）
             logger.info("IDLE 模式创建独立连接...")
@@ -278,6 +552,11 @@ class EmailListener:
             imap.login(imap_config['email'], imap_config['auth_code'])
             logger.info("IDLE 连接登录成功")
 
+            # 由内核 keepalive 探测死连接；等待数据用 select，读超时只用于发现读到一半的停顿
+            _enable_tcp_keepalive(imap.sock)
+            _unbuffer_reader(imap)
+            imap.sock.settimeout(self.IDLE_READ_TIMEOUT)
+
             # 选择文件夹
             status, _ = imap.select(self.folder)
             if status != 'OK':
@@ -292,15 +571,10 @@ class EmailListener:
 
             logger.info("服务器支持 IDLE 模式")
 
-            # 3. 发送 IDLE 命令
-            tag = imap._new_tag().decode()
-            imap.send(f'{tag} IDLE\r\n'.encode())
-
-            # 等待确认响应: 必须收到以 '+' 开头的响应才代表进入 IDLE 状态
-            imap.sock.settimeout(10)  # 设置较短的超时等待确认
-            initial_resp = imap.readline()
-            if not initial_resp or not initial_resp.startswith(b'+'):
-                logger.error(f"未能进入 IDLE 状态: {initial_resp}")
+            # 3. 发送 IDLE 命令，必须收到以 '+' 开头的响应才代表进入 IDLE 状态
+            tag = self._start_idle(imap)
+            if tag is None:
+                logger.error("未能进入 IDLE 状态")
                 return False
 
             logger.info("成功进入 IMAP IDLE 实时模式")
@@ -310,10 +584,20 @@ class EmailListener:
             idle_count = 0
             need_reconnect = False
 
+            # 死连接由 TCP keepalive 发现，这里只需在服务器 IDLE 超时前醒来续期
+            rearm_interval = max(min(self.idle_timeout - 10, self.IDLE_REARM_INTERVAL), 10)
+
             while self._running and not need_reconnect:
                 try:
-                    # 设置超时时间（10秒心跳，更激进地维持连接）
-                    imap.sock.settimeout(10)
+                    if not _wait_readable(imap, rearm_interval):
+                        # 到达续期时间且没有数据：在同一连接上 DONE + IDLE 续期，无需重建连接
+                        idle_count += 1
+                        logger.info(f"IDLE 续期 #{idle_count}")
+                        tag = self._rearm_idle(imap, tag)
+                        if tag is None:
+                            need_reconnect = True
+                            break
+                        continue
 
                     line = imap.readline()
                     if not line:
@@ -321,49 +605,21 @@ class EmailListener:
                         need_reconnect = True
                         break
 
-                    line_str = line.decode('utf-8', errors='ignore')
-                    logger.debug(f"IDLE 收到数据: {line_str.strip()}")
-
-                    # 检查是否有新邮件信号
-                    if b'EXISTS' in line or b'RECENT' in line:
-                        logger.info(f"检测到新邮件信号: {line_str.strip()}")
-
-                        # 必须先发送 DONE 退出 IDLE
-                        try:
-                            imap.send(b'DONE\r\n')
-                            imap.sock.settimeout(5)
-                            done_resp = imap.readline()
-                            logger.debug(f"DONE 响应: {done_resp.decode('utf-8', errors='ignore').strip()}")
-                        except (socket.timeout, OSError):
-                            logger.warning("DONE 超时或连接异常，尝试继续处理邮件...")
-
-                        # 同步邮件
-                        new_emails = self._check_new_emails()
-                        if new_emails:
-                            self._process_new_emails(new_emails)
-                        else:
-                            logger.info("未找到新邮件（可能已被其他客户端标记为已读）")
-
-                        # 重新进入 IDLE
-                        try:
-                            tag = imap._new_tag().decode()
-                            imap.send(f'{tag} IDLE\r\n'.encode())
-                            imap.sock.settimeout(10)
-                            idle_resp = imap.readline()
-                            if not idle_resp.startswith(b'+'):
-                                logger.error(f"重新进入 IDLE 失败: {idle_resp}")
-                                need_reconnect = True
-                                break
-                            logger.info("重新进入 IDLE 模式成功")
-                        except (socket.timeout, OSError) as e:
-                            logger.error(f"重新进入 IDLE 失败: {type(e).__name__}: {str(e)}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("IDLE 收到数据: %s", line.decode('utf-8', errors='ignore').strip())
+
+                    # 检查是否有新邮件信号：先 DONE 退出 IDLE，同步邮件后重新进入 IDLE
+                    if _IDLE_SIGNAL.search(line):
+                        logger.info("检测到新邮件信号: %r", line.strip())
+                        tag = self._rearm_idle(imap, tag, has_signal=True)
+                        if tag is None:
                             need_reconnect = True
                             break
+                        logger.info("重新进入 IDLE 模式成功")
 
-                except (socket.timeout, OSError):
-                    # 定时心跳维持：每10秒重新建立 IDLE 连接
-                    idle_count += 1
-                    logger.info(f"IDLE 心跳 #{idle_count}，准备重建连接...")
+                except OSError:
+                    # 连接断开或读到一半停顿（socket.timeout）：文件对象已不可用，重新建立 IDLE 连接
+                    logger.info("IDLE 连接已断开，准备重建连接...")
                     need_reconnect = True  # 标记需要重连
                     break  # 退出当前循环，在外层重建连接
 
@@ -382,179 +638,296 @@ class EmailListener:
 
         except Exception as e:
             logger.error(f"IDLE 运行异常: {type(e).__name__}: {str(e)}", exc_info=True)
-            self._stats['idle_failures'] += 1
+            self._incr_stat('idle_failures')
             return False
         finally:
             # 清理连接
             if imap:
-                try:
-                    # 尝试发送 DONE 退出 IDLE
-                    imap.send(b'DONE\r\n')
-                    imap.sock.settimeout(2)
-                    imap.readline()
-                except:
-                    pass
+                # 尝试发送 DONE 退出 IDLE；没有按时结束时连接状态未知，直接关闭 socket
+                exited = tag is None
+                if tag is not None:
+                    try:
+                        imap.send(_DONE)
+                        exited = self._read_until_tagged(imap, tag, 2) is not None
+                    except OSError:
+                        pass
 
                 try:
-                    imap.close()
-                    imap.logout()
+                    if exited:
+                        imap.close()
+                        imap.logout()
+                    else:
+                        imap.shutdown()
                     logger.info("IDLE 连接已关闭")
                 except Exception as e:
                     logger.warning(f"关闭 IDLE 连接时出错: {str(e)}")
 
 
-    def _run_polling_mode_safe(self) -> None:
+    def _start_idle(self, imap: imaplib.IMAP4_SSL, timeout: float = 10) -> Optional[str]:
         """
-        安全的轮询模式实现（连接复用版本）
+        发送 IDLE 命令并等待服务器的 '+' 确认
 
-        核心改进：
-        - 复用 start() 方法中建立的 IMAP 连接
-        - 异常时自动重建连接
-        - 统计连接复用和重建次数
+        Args:
+            imap: 已选择文件夹的连接
+            timeout: 等待确认的秒数
+
+        Returns:
+            Optional[str]: IDLE 命令的标签，失败返回 None（需要重建连接）
         """
-        # 懒加载：如果 start() 中初始化失败或连接已断开，在这里重新建立
-        if self._receive_service is None:
-            self._receive_service = ReceiveEmailsService()
-            self._stats['connection_restarts'] += 1
-            logger.info("✓ IMAP 长连接已建立（轮询时延迟初始化）")
+        tag = imap._new_tag().decode()
+        imap.send(f'{tag} IDLE\r\n'.encode())
+        if not _wait_readable(imap, timeout):
+            logger.error("等待 IDLE 确认超时")
+            return None
+        idle_resp = imap.readline()
+        if not idle_resp.startswith(b'+'):
+            logger.error(f"进入 IDLE 失败: {idle_resp}")
+            return None
+        return tag
+
+    def _read_until_tagged(self, imap: imaplib.IMAP4_SSL, tag: str, timeout: float) -> Optional[bool]:
+        """
+        读取到 IDLE 命令的结束响应为止（发送 DONE 之后调用）
 
-        try:
-            # 复用现有连接查询新邮件
-            result = self._receive_service.receive_unread_emails(count=10)
+        每行之前用 select 等待，超时不会让连接的文件对象失效；读到结束响应后
+        从 imaplib 的 tagged_commands 中移除该标签，避免每次续期都留下一条记录。
+
+        Args:
+            imap: 已发送 DONE 的连接
+            tag: IDLE 命令的标签
+            timeout: 每行的最长等待秒数
+
+        Returns:
+            Optional[bool]: 期间是否收到新邮件通知；超时或连接关闭返回 None
+        """
+        has_signal = False
+        tag_prefix = tag.encode()
+        while True:
+            if not _wait_readable(imap, timeout):
+                return None
+            line = imap.readline()
+            if not line:
+                return None
+            if line.startswith(tag_prefix):
+                imap.tagged_commands.pop(tag_prefix, None)
+                return has_signal
+            if _IDLE_SIGNAL.search(line):
+                has_signal = True
+
+    def _rearm_idle(self, imap: imaplib.IMAP4_SSL, tag: str, has_signal: bool = False) -> Optional[str]:
+        """
+        结束当前 IDLE，按需同步新邮件后重新进入 IDLE
 
-            if result['success']:
-                self._stats['polling_count'] += 1
-                self._stats['connection_reuses'] += 1
+        Args:
+            imap: 处于 IDLE 状态的连接
+            tag: 当前 IDLE 命令的标签
+            has_signal: 是否已收到新邮件通知
 
-                # 过滤出真正的新邮件
-                new_emails = []
-                for email_msg in result['emails']:
-                    if email_msg.msg_id != self._last_uid:
-                        new_emails.append(email_msg)
-                        logger.debug(f"轮询发现新邮件: {email_msg.msg_id}")
+        Returns:
+            Optional[str]: 新 IDLE 命令的标签，失败返回 None（需要重建连接）
+        """
+        try:
+            imap.send(_DONE)
 
+            # 读取到当前 IDLE 的结束响应为止，期间可能夹带新邮件通知
+            signalled = self._read_until_tagged(imap, tag, 10)
+            if signalled is None:
+                logger.error("结束 IDLE 超时或连接已关闭")
+                return None
+
+            if has_signal or signalled:
+                new_emails = self._check_new_emails()
                 if new_emails:
-                    # 更新最新的邮件ID
-                    self._last_uid = new_emails[0].msg_id
-                    logger.info(f"轮询发现 {len(new_emails)} 封新邮件")
                     self._process_new_emails(new_emails)
                 else:
-                    logger.debug("轮询未发现新邮件")
+                    logger.info("未找到新邮件（可能已被其他客户端标记为已读）")
+
+            return self._start_idle(imap)
+
+        except OSError as e:
+            logger.error(f"IDLE 续期失败: {type(e).__name__}: {str(e)}")
+            return None
+
+    def _run_polling_mode_safe(self) -> None:
+        """
+        安全的轮询模式实现（连接池版本）
+
+        核心改进：
+        - 从连接池借用 IMAP 连接，用完归还
+        - 失效连接由连接池丢弃，下次借用时自动重建
+        - 连接复用和重建次数由连接池统计
+        """
+        try:
+            # 复用连接池中的连接查询新邮件（服务端按 UID 过滤，只返回真正的新邮件）
+            with self._pool.acquire() as service:
+                new_emails = self._fetch_new_emails(service)
+            self._incr_stat('polling_count')
+
+            if new_emails:
+                logger.info(f"轮询发现 {len(new_emails)} 封新邮件")
+                self._process_new_emails(new_emails)
             else:
-                logger.warning(f"轮询获取邮件失败: {result.get('message', '未知错误')}")
+                logger.debug("轮询未发现新邮件")
 
-            # 等待下次轮询
-            for i in range(self.polling_interval):
-                if not self._running:
-                    break
-                time.sleep(1)
+            # 等待下次轮询（停止时立即返回）
+            if self._stop_event.wait(self.polling_interval):
+                return
 
         except Exception as e:
-            # 连接异常时重建连接
+            # 连接异常：失效连接已由连接池丢弃，下次轮询时重建
             logger.error(f"IMAP 连接异常: {type(e).__name__}: {str(e)}")
-            logger.info("准备重建 IMAP 连接...")
-
-            # 清理旧连接
-            if self._receive_service:
-                try:
-                    self._receive_service.client.close()
-                    logger.info("旧连接已关闭")
-                except Exception as close_error:
-                    logger.warning(f"关闭旧连接时出错: {close_error}")
-
-            # 重置服务实例，下次轮询时会创建新连接
-            self._receive_service = None
-            self._stats['connection_restarts'] += 1
 
             # 短暂等待后重新抛出异常，让外层循环重试
-            time.sleep(2)
+            self._stop_event.wait(2)
             raise  # 重新抛出异常，让外层处理重连
 
-    def _check_new_emails(self) -> List[EmailMessage]:
+    def _latest_uid(self, service: ReceiveEmailsService) -> str:
         """
-        检查新邮件
+        获取文件夹中最新一封邮件的 UID
+
+        Args:
+            service: 持有连接的邮件接收服务
 
         Returns:
-            List[EmailMessage]: 新邮件列表
+            str: 最新邮件 UID，文件夹为空时返回 '0'
         """
-        imap = None
-        try:
-            # 创建独立连接用于读取邮件
-            imap_config = self._imap_client.imap_config
-            imap = imaplib.IMAP4_SSL(
-                imap_config['imap_server'],
-                imap_config['imap_port']
+        uids = service.client.search_emails(criteria='*', folder=self.folder, uid=True)
+        return uids[-1].decode() if uids else '0'
+
+    def _fetch_new_emails(self, service: ReceiveEmailsService) -> List[EmailMessage]:
+        """
+        获取 UID 大于 _last_uid 的未读邮件（连接层异常直接抛出）
+
+        使用 UID SEARCH UID <last+1>:* 由服务器返回增量，无需在客户端逐封比较。
+
+        Args:
+            service: 持有连接的邮件接收服务
+
+        Returns:
+            List[EmailMessage]: 新邮件列表（最新的在前）
+        """
+        client = service.client
+
+        if self._last_uid is not None:
+            last_uid = int(self._last_uid)
+            uids = client.search_emails(
+                criteria=f'UID {last_uid + 1}:* UNSEEN', folder=self.folder, uid=True
             )
-            imap.login(imap_config['email'], imap_config['auth_code'])
-            imap.select(self.folder)
+            # 没有更大的 UID 时，"n:*" 仍会匹配最后一封邮件，需要排除
+            uids = [uid for uid in uids if int(uid) > last_uid]
+        else:
+            # 尚无基准 UID：退回到最近的 10 封未读邮件
+            uids = client.search_emails(criteria='UNSEEN', folder=self.folder, uid=True)[-10:]
 
-            # 搜索未读邮件
-            status, messages = imap.search(None, 'UNSEEN')
-            if status != 'OK':
-                logger.error(f"搜索未读邮件失败: {status}")
-                return []
+        found_uids = [uid.decode() if isinstance(uid, bytes) else uid for uid in uids]
+        # 跳过已分发但可能尚未标记已读的邮件
+        uids = [uid for uid in found_uids if uid not in self._seen_uids]
 
-            email_ids = messages[0].split()
-            logger.info(f"找到 {len(email_ids)} 封未读邮件")
+        logger.info(f"找到 {len(uids)} 封新邮件")
 
-            if not email_ids:
-                return []
+        if not uids:
+            # 全部已分发过：直接推进基准 UID，避免下次重复搜索
+            self._advance_last_uid(found_uids, set())
+            return []
 
-            # 解析邮件
-            new_emails = []
-            service = ReceiveEmailsService()
+        # 一次 UID FETCH 获取全部新邮件
+        raw_emails = client.fetch_emails(uids, folder=self.folder, uid=True)
 
-            for msg_id in reversed(email_ids[-10:]):  # 最多获取最新的10封
-                try:
-                    msg_id_str = msg_id.decode() if isinstance(msg_id, bytes) else msg_id
+        fetched_uids = []
+        for uid_str in uids:
+            if uid_str in raw_emails:
+                fetched_uids.append(uid_str)
+            else:
+                logger.warning(f"获取邮件失败: {uid_str}")
 
-                    # 跳过已处理的邮件
-                    if msg_id_str == self._last_uid:
-                        logger.debug(f"跳过已处理邮件: {msg_id_str}")
-                        continue
+        # 解析邮件（MIME 解析分发到解析线程池）
+        parse_args = (
+            [service] * len(fetched_uids),
+            fetched_uids,
+            [raw_emails[uid_str] for uid_str in fetched_uids]
+        )
+        if self._parse_executor:
+            parsed = list(self._parse_executor.map(self._parse_one, *parse_args))
+        else:
+            parsed = list(map(self._parse_one, *parse_args))
+        new_emails = [email_msg for email_msg in parsed if email_msg is not None]
+
+        # 获取或解析失败的邮件不计入，下次搜索时重试
+        self._advance_last_uid(
+            found_uids,
+            {uid_str for uid_str, email_msg in zip(fetched_uids, parsed) if email_msg is None}
+            | (set(uids) - set(fetched_uids))
+        )
 
-                    # 获取邮件内容
-                    status, msg_data = imap.fetch(msg_id, '(RFC822)')
-                    if status != 'OK':
-                        logger.warning(f"获取邮件失败: {msg_id_str}")
-                        continue
+        # 记录已分发的 UID，超出窗口时淘汰最早的
+        for uid_str in fetched_uids:
+            self._seen_uids[uid_str] = None
+        while len(self._seen_uids) > self.SEEN_MAX:
+            self._seen_uids.popitem(last=False)
 
-                    import email
-                    raw_email = msg_data[0][1]
-                    msg = email.message_from_bytes(raw_email)
+        new_emails.reverse()
+        return new_emails
 
-                    # 解析邮件
-                    email_msg = service._parse_email_message(msg, msg_id_str)
-                    new_emails.append(email_msg)
+    def _advance_last_uid(self, found_uids: List[str], failed_uids: Set[str]) -> None:
+        """
+        推进基准 UID：只推进到第一封失败邮件之前，保证失败的邮件下次仍能被搜索到
 
-                    # # 标记为已读
-                    # self.imap.store(self.msg_id, '+FLAGS', '\\Seen')
-                    # logger.info(f"解析新邮件: {email_msg.subject} from {email_msg.from_email}")
+        Args:
+            found_uids: 本次搜索到的 UID（包括已分发过的）
+            failed_uids: 获取或解析失败的 UID
+        """
+        for uid_str in sorted(found_uids, key=int):
+            if uid_str in failed_uids:
+                break
+            self._last_uid = uid_str
 
-                    # 更新最新 UID
-                    self._last_uid = msg_id_str
+    def _parse_one(
+        self,
+        service: ReceiveEmailsService,
+        uid: str,
+        raw_email: bytes
+    ) -> Optional[EmailMessage]:
+        """
+        解析单封邮件（在解析线程池中运行）
 
-                except Exception as e:
-                    logger.error(f"解析邮件 {msg_id} 失败: {str(e)}")
-                    continue
+        监听路径只解析邮件头，正文和附件由回调首次访问时再解析。
 
-            return new_emails
+        Args:
+            service: 提供解析逻辑的邮件接收服务
+            uid: 邮件 UID
+            raw_email: 邮件原始内容
 
+        Returns:
+            Optional[EmailMessage]: 解析结果，失败返回 None
+        """
+        try:
+            return service._parse_email_headers(raw_email, uid)
+        except Exception as e:
+            logger.error(f"解析邮件 {uid} 失败: {str(e)}")
+            return None
+
+    def _check_new_emails(self) -> List[EmailMessage]:
+        """
+        检查新邮件（复用连接池中的连接，不再单独建立连接）
+
+        Returns:
+            List[EmailMessage]: 新邮件列表
+        """
+        try:
+            with self._pool.acquire() as service:
+                return self._fetch_new_emails(service)
+
+        except (imaplib.IMAP4.error, OSError) as e:
+            # 连接失效：连接池已丢弃该连接，下次使用时重建
+            logger.error(f"检查新邮件时连接异常: {type(e).__name__}: {str(e)}")
+            return []
         except Exception as e:
             logger.error(f"检查新邮件失败: {type(e).__name__}: {str(e)}")
             return []
-        finally:
-            # 关闭独立连接
-            if imap:
-                try:
-                    imap.close()
-                    imap.logout()
-                except:
-                    pass
 
     def _process_new_emails(self, emails: List[EmailMessage]) -> None:
         """
-        处理新邮件（异步非阻塞版本）
+        处理新邮件（非阻塞：只入队，由合并线程批量标记已读并提交回调）
 
         Args:
             emails: 新邮件列表
@@ -562,38 +935,142 @@ class EmailListener:
         if not emails:
             return
 
-        self._stats['total_received'] += len(emails)
-        logger.info(f"收到 {len(emails)} 封新邮件")
+        self._incr_stat('total_received', len(emails))
+        # 整批只记一条日志（摘要列表仅在 INFO 启用时构造）
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "收到 %d 封新邮件: %s",
+                len(emails),
+                [f"{email_msg.subject} ({email_msg.from_email})" for email_msg in emails]
+            )
 
-        # 打印邮件摘要
         for email_msg in emails:
-            logger.info(f"  - {email_msg.subject} ({email_msg.from_email})")
+            self._pending_queue.put_nowait(email_msg)
+
+    def _drain_pending_emails(self) -> None:
+        """
+        合并线程主循环
+
+        取出首封邮件后，在 BATCH_MAX_WAIT 窗口内继续收集（最多 BATCH_MAX_SIZE 封），
+        然后整批执行一次标记已读和一次回调提交。停止时会先排空队列再退出。
+
+        在途任务达到上限时等待 SUBMIT_TIMEOUT 秒，仍无空位则把本批并入下一批（背压）。
+        """
+        carry: List[EmailMessage] = []
+        while self._running or carry or not self._pending_queue.empty():
+            batch, carry = carry, []
+            if not batch:
+                try:
+                    batch = [self._pending_queue.get(timeout=self.BATCH_MAX_WAIT)]
+                except queue.Empty:
+                    continue
+
+            deadline = time.monotonic() + self.BATCH_MAX_WAIT
+            while len(batch) < self.BATCH_MAX_SIZE:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        batch.append(self._pending_queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._pending_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if not self._submit_sem.acquire(timeout=self.SUBMIT_TIMEOUT):
+                logger.warning(
+                    f"回调处理积压（背压）：在途任务已达上限 "
+                    f"{self.max_workers * self.SUBMIT_QUEUE_FACTOR}，{len(batch)} 封邮件并入下一批"
+                )
+                carry = batch
+                continue
+
+            try:
+                self._dispatch_batch(batch)
+            except Exception as e:
+                logger.error(f"批量处理新邮件失败: {str(e)}", exc_info=True)
 
-        # 先标记邮件为已读（避免重复处理）
+    def _dispatch_batch(self, emails: List[EmailMessage]) -> None:
+        """
+        将一批新邮件作为一个任务提交到线程池（标记已读 + 回调都在工作线程中执行）
+
+        调用前须已获取 _submit_sem，任务完成（或未能提交）时释放
+
+        Args:
+            emails: 合并后的新邮件列表
+        """
+        # 提交到线程池异步处理（非阻塞）
+        if self._executor:
+            # 先计数再提交，避免任务在计数前完成导致计数为负
+            with self._stats_lock:
+                self._stats['processing_tasks'] += 1
+                processing = self._stats['processing_tasks']
+                self._tasks_done.clear()
+
+            try:
+                future = self._executor.submit(self._handle_batch, emails)
+            except Exception:
+                with self._stats_lock:
+                    self._stats['processing_tasks'] -= 1
+                    if self._stats['processing_tasks'] == 0:
+                        self._tasks_done.set()
+                self._submit_sem.release()
+                raise
+
+            # 添加回调函数，处理完成和异常
+            future.add_done_callback(self._on_task_complete)
+
+            logger.info(f"邮件已提交到线程池处理，当前待处理任务: {processing}")
+        else:
+            self._submit_sem.release()
+            logger.error("线程池未初始化，无法处理邮件")
+
+    def _handle_batch(self, emails: List[EmailMessage]) -> None:
+        """
+        处理一批新邮件（在工作线程中运行）：先标记已读，再执行回调
+
+        Args:
+            emails: 新邮件列表
+        """
+        self._mark_as_seen(emails)
+        self._execute_callback(emails)
+
+    def _mark_as_seen(self, emails: List[EmailMessage]) -> None:
+        """
+        用一条 UID STORE 将整批邮件标记为已读（避免重复处理）
+
+        Args:
+            emails: 新邮件列表
+        """
         try:
             msg_ids_to_mark = [email_msg.msg_id for email_msg in emails]
 
-            # 使用活跃的连接（_receive_service.client）而不是 _imap_client
-            # 因为 _receive_service.client 一直在轮询，连接是活跃的
-            if self._receive_service and self._receive_service.client:
-                mark_result = self._receive_service.client.store_flags(
-                    msg_ids=msg_ids_to_mark,
-                    flag_command='+FLAGS',
-                    flags='\\Seen',
-                    folder=self.folder
-                )
+            # 优先使用连接池中的活跃连接（UID 在不同连接间通用）
+            try:
+                with self._pool.acquire(timeout=5) as service:
+                    mark_result = service.client.store_flags(
+                        msg_ids=msg_ids_to_mark,
+                        flag_command='+FLAGS',
+                        flags='\\Seen',
+                        folder=self.folder,
+                        uid=True
+                    )
+            except queue.Empty:
+                mark_result = None
+
+            if mark_result is not None:
                 if mark_result['success']:
                     logger.info(f"成功标记 {mark_result['count']} 封邮件为已读")
                 else:
                     logger.warning(f"标记邮件为已读失败: {mark_result.get('message', '未知错误')}")
             else:
-                # 降级到 _imap_client（可能需要重连）
-                logger.warning("活跃连接不可用，使用备用连接标记邮件")
+                # 连接池繁忙，降级到 _imap_client（可能需要重连）
+                logger.warning("连接池暂无可用连接，使用备用连接标记邮件")
                 mark_result = self._imap_client.store_flags(
                     msg_ids=msg_ids_to_mark,
                     flag_command='+FLAGS',
                     flags='\\Seen',
-                    folder=self.folder
+                    folder=self.folder,
+                    uid=True
                 )
                 if mark_result['success']:
                     logger.info(f"成功标记 {mark_result['count']} 封邮件为已读")
@@ -602,21 +1079,6 @@ class EmailListener:
         except Exception as e:
             logger.error(f"标记邮件为已读时出错: {str(e)}")
 
-        # 提交到线程池异步处理（非阻塞）
-        if self._executor:
-            future = self._executor.submit(self._execute_callback, emails)
-            self._pending_futures.append(future)
-
-            # 添加回调函数，处理完成和异常
-            future.add_done_callback(self._on_task_complete)
-
-            # 更新统计
-            self._stats['processing_tasks'] = len(self._pending_futures)
-
-            logger.info(f"邮件已提交到线程池处理，当前待处理任务: {self._stats['processing_tasks']}")
-        else:
-            logger.error("线程池未初始化，无法处理邮件")
-
     def _execute_callback(self, emails: List[EmailMessage]) -> None:
         """
         执行回调函数（在工作线程中运行）
@@ -637,22 +1099,21 @@ class EmailListener:
         Args:
             future: 已完成的 Future 对象
         """
-        # 从待处理列表中移除
-        if future in self._pending_futures:
-            self._pending_futures.remove(future)
-
         # 更新统计
-        self._stats['processing_tasks'] = len(self._pending_futures)
-        self._stats['completed_tasks'] += 1
+        with self._stats_lock:
+            self._stats['processing_tasks'] -= 1
+            self._stats['completed_tasks'] += 1
+            processing = self._stats['processing_tasks']
+            completed = self._stats['completed_tasks']
+            if processing == 0:
+                self._tasks_done.set()
+        self._submit_sem.release()
 
         # 检查是否有异常
         if future.exception():
             logger.error(f"邮件处理任务异常: {future.exception()}")
 
-        logger.debug(
-            f"任务完成，当前待处理: {self._stats['processing_tasks']}, "
-            f"已完成: {self._stats['completed_tasks']}"
-        )
+        logger.debug("任务完成，当前待处理: %d, 已完成: %d", processing, completed)
 
     def get_status(self) -> Dict[str, Any]:
         """
@@ -661,25 +1122,31 @@ class EmailListener:
         Returns:
             Dict: 状态信息
         """
+        # 一次性在锁内取快照，避免读到其他线程更新到一半的统计
+        with self._stats_lock:
+            stats = self._stats.copy()
+
         return {
             'running': self._running,
-            'mode': self.mode.value,
+            'mode': self._mode_str,
             'folder': self.folder,
             'last_uid': self._last_uid,
             'thread_alive': self._thread.is_alive() if self._thread else False,
-            'stats': self._stats.copy(),
+            'stats': stats,
             # 线程池状态
             'thread_pool': {
                 'max_workers': self.max_workers,
-                'active_tasks': self._stats['processing_tasks'],
-                'completed_tasks': self._stats['completed_tasks']
+                'active_tasks': stats['processing_tasks'],
+                'completed_tasks': stats['completed_tasks']
             } if self._executor else None,
             # 连接复用状态（新增）
             'connection': {
-                'is_established': self._receive_service is not None,
-                'reuses': self._stats.get('connection_reuses', 0),
-                'restarts': self._stats.get('connection_restarts', 0),
-                'reuse_rate': f"{(self._stats.get('connection_reuses', 0) / max(self._stats.get('polling_count', 1), 1) * 100):.1f}%"
+                'is_established': self._pool.size > 0,
+                'pool_size': self._pool.size,
+                'pool_max_size': self._pool.max_size,
+                'reuses': self._pool.reused,
+                'restarts': self._pool.created,
+                'reuse_rate': f"{(self._pool.reused / max(self._pool.reused + self._pool.created, 1) * 100):.1f}%"
             }
         }
 
@@ -700,7 +1167,7 @@ class EmailListener:
         elif mode == ListenerMode.POLLING:
             logger.info("手动切换到轮询模式")
             self.mode = ListenerMode.POLLING
-            self._stats['mode_switches'] += 1
+            self._incr_stat('mode_switches')
             return True
         else:
             return False
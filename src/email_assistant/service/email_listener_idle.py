@@ -1,17 +1,21 @@
+import os
 import threading
 import time
 import logging
+import queue
 import socket
 import imaplib
-import select
-from typing import Callable, Dict, Any, List, Optional
+import selectors
+import ssl
+from collections import OrderedDict, deque
+from typing import Callable, Dict, Any, List, Optional, Set
 from enum import Enum
-from concurrent.futures import ThreadPoolExecutor, Future
 from dataclasses import dataclass
 
 # 假设这些类在你的项目中已定义，此处保持导入路径
 from .receive_emails_service import EmailMessage, ReceiveEmailsService
 from .email_client import IMAPClient
+from .email_listener import _enable_tcp_keepalive
 
 # 配置日志
 logger = logging.getLogger(__name__)
@@ -31,7 +35,76 @@ class IdleConfig:
     retry_delay: int = 5
     max_workers: int = 3
     initial_sync_count: int = 10
-    debug_mode: bool = True            # 建议开启以观察原始信号
+    debug_mode: bool = True            # 建议开启以观察原始信号（记录最近的原始数据行，连接失效时输出）
+    pin_to_nic_core: bool = False      # 将 IDLE 线程绑定到网卡接收中断所在的 CPU（仅 Linux）
+
+
+def _parse_cpu_list(text: str) -> Set[int]:
+    """解析 CPU 列表字符串（如 '0-3,8'）"""
+    cpus = set()
+    for part in text.strip().split(','):
+        if not part:
+            continue
+        if '-' in part:
+            first, last = part.split('-', 1)
+            cpus.update(range(int(first), int(last) + 1))
+        else:
+            cpus.add(int(part))
+    return cpus
+
+
+def _interface_for_address(address: str) -> Optional[str]:
+    """根据本地 IP 找到对应的网络接口名（逐个接口查询 SIOCGIFADDR，仅 Linux）"""
+    try:
+        import fcntl
+        import struct
+    except ImportError:
+        return None
+
+    SIOCGIFADDR = 0x8915
+    probe = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        for _, name in socket.if_nameindex():
+            try:
+                packed = fcntl.ioctl(probe.fileno(), SIOCGIFADDR, struct.pack('256s', name.encode()[:15]))
+            except OSError:
+                continue
+            if socket.inet_ntoa(packed[20:24]) == address:
+                return name
+    finally:
+        probe.close()
+    return None
+
+
+def _rx_cpus_for_socket(sock: socket.socket) -> Set[int]:
+    """
+    找到处理该 Socket 所在网卡接收中断的 CPU 集合
+
+    读取 /proc/interrupts 中属于该网卡的中断号，再读取各中断的 smp_affinity_list。
+
+    Args:
+        sock: 已连接的 Socket
+
+    Returns:
+        Set[int]: CPU 编号集合，无法确定时为空集合
+    """
+    iface = _interface_for_address(sock.getsockname()[0])
+    if not iface:
+        return set()
+
+    cpus: Set[int] = set()
+    try:
+        with open('/proc/interrupts') as f:
+            for line in f:
+                fields = line.split()
+                if not fields or not fields[0].rstrip(':').isdigit() or not fields[-1].startswith(iface):
+                    continue
+                irq = fields[0].rstrip(':')
+                with open(f'/proc/irq/{irq}/smp_affinity_list') as affinity:
+                    cpus |= _parse_cpu_list(affinity.read())
+    except OSError:
+        return set()
+    return cpus
 
 class EmailListenerIdle:
     """
@@ -39,6 +112,15 @@ class EmailListenerIdle:
     解决了 SSL 缓冲区残留信号丢失以及 Socket 超时导致的连接损毁问题
     """
 
+    PROCESSED_UIDS_MAX = 1000
+    # 回调队列容量（按批计）/ 消费线程单次合并的最大批数
+    CALLBACK_QUEUE_SIZE = 64
+    CALLBACK_MAX_BATCHES = 32
+    # debug_mode 下保留的最近原始数据行数
+    RAW_LINES_MAX = 256
+    # IDLE 期间单次读取上限（大于 imaplib 读缓冲，保证一次取空缓冲区）
+    IDLE_READ_SIZE = 65536
+
     def __init__(
         self,
         new_email_callback: Callable[[List[EmailMessage]], None],
@@ -47,19 +129,33 @@ class EmailListenerIdle:
     ):
         self.new_email_callback = new_email_callback
         self.config = config or IdleConfig()
+        # 初始化后不再变化，快照为实例属性供热路径直接读取
+        self._debug = self.config.debug_mode
+        # debug_mode 下最近收到的 IDLE 原始数据行（只记录不格式化，连接失效时输出排查）
+        self._raw_lines: "deque[bytes]" = deque(maxlen=self.RAW_LINES_MAX)
         self._imap_client = imap_client if imap_client else IMAPClient()
         
         self._idle_conn: Optional[imaplib.IMAP4_SSL] = None
+        # IDLE 期间自行读取的数据中尚未处理的部分（不完整的行）
+        self._idle_buf = b''
+        # 当前 IDLE 命令的标签：读到其标签响应后需从 imaplib 的 tagged_commands 中移除
+        self._idle_tag: Optional[bytes] = None
+        # 每条连接注册一次的就绪通知器（Linux 下为 epoll），等待时无需反复构造 fd 集合
+        self._selector: Optional[selectors.BaseSelector] = None
         self._receive_service = ReceiveEmailsService()
         
         self.state = IdleState.STOPPED
         self._running = False
         self._thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
+        # 初始同步完成信号：IDLE 连接与初始同步并行建立，处理新邮件前需等待同步完成
+        self._sync_done = threading.Event()
         
-        self._processed_uids: set = set()
-        self._executor = ThreadPoolExecutor(max_workers=self.config.max_workers)
-        self._pending_futures: List[Future] = []
+        # 已处理 UID（按插入顺序的有界 LRU，超出 PROCESSED_UIDS_MAX 时淘汰最早的）
+        self._processed_uids: "OrderedDict[str, None]" = OrderedDict()
+        # 有界回调队列 + 单消费线程：IDLE 线程只负责入队，回调按到达顺序合并执行
+        self._callback_queue: "queue.Queue[List[EmailMessage]]" = queue.Queue(maxsize=self.CALLBACK_QUEUE_SIZE)
+        self._callback_thread: Optional[threading.Thread] = None
 
     def start(self, initial_sync: bool = True) -> bool:
         if self._running: return False
@@ -68,8 +164,15 @@ class EmailListenerIdle:
         self._running = True
         self._stop_event.clear()
 
+        # 初始同步使用独立连接，与 IDLE 连接的握手登录并行进行
+        self._sync_done.clear()
         if initial_sync:
-            self._initial_sync()
+            threading.Thread(target=self._initial_sync, name="IdleInitialSync", daemon=True).start()
+        else:
+            self._sync_done.set()
+
+        self._callback_thread = threading.Thread(target=self._run_callbacks, name="IdleCallbackThread", daemon=True)
+        self._callback_thread.start()
 
         self._thread = threading.Thread(target=self._run_loop, name="IdleThread", daemon=True)
         self._thread.start()
@@ -79,15 +182,14 @@ class EmailListenerIdle:
         self._running = False
         self._stop_event.set()
         self._close_connection()
-        if self._executor:
-            self._executor.shutdown(wait=False)
         logger.info("IDLE 监听服务已指令停止")
 
     def _run_loop(self):
         """主监听循环"""
         while self._running:
             try:
-                if not self._establish_connection():
+                # 仅在没有可用连接时才重新握手登录
+                if self._idle_conn is None and not self._establish_connection():
                     time.sleep(self.config.retry_delay)
                     continue
 
@@ -102,26 +204,83 @@ class EmailListenerIdle:
 
                     # 3. 退出 IDLE 模式以进行后续操作
                     self.state = IdleState.PROCESSING
-                    self._exit_idle_mode()
+                    if not has_signal:
+                        if not self._exit_idle_mode():
+                            break # 退出超时或连接异常，重建连接
+                        continue
 
-                    # 4. 如果有信号，抓取邮件
-                    if has_signal:
-                        self._handle_new_emails()
+                    # 4. 有信号：DONE 与 UID SEARCH 一起发出，再抓取邮件
+                    new_uids = self._exit_and_search()
+                    if new_uids is None:
+                        break # 连接异常，重建连接
+                    self._handle_new_emails(new_uids)
                     
                     # 检查是否需要重建连接（心跳保活）
                     # 正常循环会自动进入下一次 IDLE
 
             except Exception as e:
                 logger.error(f"监听循环异常: {e}", exc_info=True)
+
+            # IDLE 循环中断：先用 NOOP 探测现有连接，只有连接确实失效时才重建
+            if self._running and not self._probe_connection():
+                self._dump_raw_lines()
                 self._close_connection()
                 time.sleep(self.config.retry_delay)
 
+    def _dump_raw_lines(self):
+        """输出最近收到的原始数据行（仅 debug_mode）"""
+        if not self._raw_lines:
+            return
+        logger.warning(
+            "连接失效前最近 %d 行 IDLE 原始数据:\n%s",
+            len(self._raw_lines),
+            b'\n'.join(line.rstrip() for line in self._raw_lines).decode('utf-8', errors='replace')
+        )
+        self._raw_lines.clear()
+
+    def _probe_connection(self) -> bool:
+        """用 NOOP 检查 IDLE 连接是否仍然可用"""
+        if self._idle_conn is None:
+            return False
+        try:
+            self._idle_conn.sock.settimeout(10)
+            typ, _ = self._idle_conn.noop()
+            self._idle_conn.sock.settimeout(None)
+            if typ == 'OK':
+                logger.info("IDLE 连接仍然有效，直接重新进入 IDLE")
+                return True
+        except (imaplib.IMAP4.error, OSError) as e:
+            logger.warning(f"IDLE 连接已失效: {e}")
+        return False
+
+    def _run_callbacks(self):
+        """回调消费循环：取出一批后顺带合并队列中已积压的批次，一次回调处理"""
+        while self._running or not self._callback_queue.empty():
+            try:
+                batches = [self._callback_queue.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+
+            while len(batches) < self.CALLBACK_MAX_BATCHES:
+                try:
+                    batches.append(self._callback_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            emails = [email_msg for batch in batches for email_msg in batch]
+            try:
+                self.new_email_callback(emails)
+            except Exception as e:
+                logger.error(f"执行邮件回调失败: {e}", exc_info=True)
+
     def _establish_connection(self) -> bool:
         """建立并初始化 IMAP 连接"""
         try:
             self._close_connection()
             conf = self._imap_client.imap_config
             self._idle_conn = imaplib.IMAP4_SSL(conf['imap_server'], conf['imap_port'])
+            # TCP keepalive：内核尽早发现断开的连接，避免 IDLE 长时间挂在死连接上
+            _enable_tcp_keepalive(self._idle_conn.sock)
             self._idle_conn.login(conf['email'], conf['auth_code'])
             self._idle_conn.select(self.config.folder)
             
@@ -129,32 +288,66 @@ class EmailListenerIdle:
             _, caps = self._idle_conn.capability()
             if b'IDLE' not in caps[0]:
                 logger.error("服务器不支持 IDLE")
+                self._close_connection()
                 return False
+
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self._idle_conn.sock, selectors.EVENT_READ)
+
+            if self.config.pin_to_nic_core:
+                self._pin_to_rx_cpus()
             
             logger.info(f"✓ IDLE 连接已就绪: {conf['email']}")
             return True
         except Exception as e:
             logger.error(f"建立连接失败: {e}")
+            self._close_connection()
             return False
 
+    def _pin_to_rx_cpus(self):
+        """将当前（IDLE）线程绑定到网卡接收中断所在的 CPU，减少跨核/跨 chiplet 的缓存失效"""
+        if not hasattr(os, 'sched_setaffinity'):
+            logger.warning("当前平台不支持 CPU 绑定，忽略 pin_to_nic_core")
+            return
+
+        cpus = _rx_cpus_for_socket(self._idle_conn.sock) & os.sched_getaffinity(0)
+        if not cpus:
+            logger.warning("无法确定网卡接收中断所在 CPU，跳过 CPU 绑定")
+            return
+
+        try:
+            # pid 为 0 表示当前线程（Linux 上亲和性按线程生效）
+            os.sched_setaffinity(0, cpus)
+            logger.info(f"IDLE 线程已绑定到 CPU: {sorted(cpus)}")
+        except OSError as e:
+            logger.warning(f"CPU 绑定失败: {e}")
+
     def _enter_idle_mode(self) -> bool:
         """发送 IDLE 命令"""
         try:
-            # 清空 Socket 现有缓冲区
-            self._idle_conn.sock.setblocking(False)
-            try:
-                while self._idle_conn.sock.recv(4096): pass
-            except: pass
-            self._idle_conn.sock.setblocking(True)
+            # 清空 SSL 层已解密的残留数据：pending() 的字节已在内存中，
+            # 一次 recv 即可取走，不会阻塞，无需切换非阻塞模式或循环读取
+            conn = self._idle_conn
+            sock = conn.sock
+            pending = sock.pending() if isinstance(sock, ssl.SSLSocket) else 0
+            if pending:
+                sock.recv(pending)
 
             # 发送 IDLE
-            tag = self._idle_conn._new_tag().decode()
-            self._idle_conn.send(f'{tag} IDLE\r\n'.encode())
+            self._idle_tag = conn._new_tag()
+            conn.send(self._idle_tag + b' IDLE\r\n')
             
-            # 等待 "+" 确认
-            resp = self._idle_conn.readline()
-            if resp and resp.startswith(b'+'):
-                if self.config.debug_mode: logger.debug("IDLE 模式激活成功")
+            # 等待 "+" 确认。从这里到 DONE 之前都用 read1 自行读取，
+            # 确保 imaplib 读缓冲在等待期间始终为空（见 _wait_for_signal）
+            buf = b''
+            while b'\n' not in buf:
+                chunk = conn.file.read1(self.IDLE_READ_SIZE)
+                if not chunk:
+                    return False
+                buf += chunk
+            resp, _, self._idle_buf = buf.partition(b'\n')
+            if resp.startswith(b'+'):
+                if self._debug: logger.debug("IDLE 模式激活成功")
                 return True
             return False
         except Exception as e:
@@ -164,99 +357,216 @@ class EmailListenerIdle:
     def _wait_for_signal(self, timeout: int) -> bool:
         """
         核心监控逻辑：双重探测机制
-        同时监控系统 Socket 和 SSL 内存缓冲区
+        先处理内存中已有的数据，没有数据时才在注册好的 selector 上阻塞等待 Socket 可读
+
+        IDLE 期间用 read1 读取：每次都会取空 imaplib 的读缓冲，
+        因此缓冲区中只可能剩下 SSL 层已解密的数据，用 pending() 即可判断，
+        无需切换 Socket 阻塞模式去探测。
         """
-        sock = self._idle_conn.sock
-        start_time = time.time()
+        # 循环内用到的属性和方法先绑定为局部变量
+        monotonic_ns = time.monotonic_ns
+        ssl_pending = self._idle_conn.sock.pending
+        wait_readable = self._selector.select
+        read1 = self._idle_conn.file.read1
+        read_size = self.IDLE_READ_SIZE
+        is_new_mail_signal = self._is_new_mail_signal
 
-        while self._running and (time.time() - start_time < timeout):
-            # A. 预检：SSL 内存缓冲区探测（解决信号卡在内存的问题）
-            sock.setblocking(False)
-            try:
-                line = self._idle_conn.readline()
-                if line and self._is_new_mail_signal(line):
-                    return True
-            except:
-                pass # 缓冲区无完整行
-            finally:
-                sock.setblocking(True)
-
-            # B. 阻塞：Select 监控系统 Socket
-            remaining = max(0, timeout - (time.time() - start_time))
-            if remaining <= 0: break
-            
-            r, _, _ = select.select([sock], [], [], remaining)
-            if r:
-                try:
-                    line = self._idle_conn.readline()
-                    if not line: return False # 连接断开
-                    if self._is_new_mail_signal(line):
+        # 整数纳秒计时：不受系统时间调整影响，循环内无浮点运算
+        deadline_ns = monotonic_ns() + timeout * 1_000_000_000
+        buf = self._idle_buf
+
+        try:
+            while self._running:
+                # A. 先处理已读入内存的完整行（解决信号卡在内存的问题）
+                while b'\n' in buf:
+                    line, _, buf = buf.partition(b'\n')
+                    if is_new_mail_signal(line):
                         return True
-                except Exception as e:
-                    logger.error(f"读取数据流异常: {e}")
-                    return False
-            else:
-                return False # 自然超时（心跳）
+
+                # B. 内存中没有待读数据时，阻塞等待系统 Socket 可读
+                if not ssl_pending():
+                    remaining_ns = deadline_ns - monotonic_ns()
+                    if remaining_ns <= 0:
+                        return False # 自然超时（心跳）
+                    if not wait_readable(remaining_ns / 1e9):
+                        return False # 自然超时（心跳）
+
+                chunk = read1(read_size)
+                if not chunk: return False # 连接断开
+                buf += chunk
+                if len(buf) > read_size and b'\n' not in buf:
+                    logger.warning("IDLE 收到超长数据行，已丢弃")
+                    buf = b''
+        except (OSError, imaplib.IMAP4.error) as e:
+            logger.error(f"读取数据流异常: {e}")
+            return False
+        finally:
+            self._idle_buf = buf
         return False
 
     def _is_new_mail_signal(self, line: bytes) -> bool:
-        """信号解析逻辑"""
-        line_str = line.decode('utf-8', errors='ignore').upper()
-        if self.config.debug_mode:
-            logger.debug(f"RAW: {line_str.strip()}")
-        
+        """信号解析逻辑（直接在字节上匹配：IMAP 响应为 ASCII，关键字固定大写）"""
+        if self._debug:
+            self._raw_lines.append(line)
+
         # EXISTS 代表邮件数量变化，这是最可靠的信号
-        if 'EXISTS' in line_str or 'RECENT' in line_str:
-            logger.info(f"🔔 捕获到新邮件信号: {line_str.strip()}")
+        if b' EXISTS' in line or b' RECENT' in line:
+            logger.info("🔔 捕获到新邮件信号: %r", line.rstrip())
             return True
         return False
 
-    def _exit_idle_mode(self):
-        """安全退出 IDLE"""
+    def _exit_idle_mode(self) -> bool:
+        """
+        安全退出 IDLE：发送 DONE 并读到 IDLE 命令的标签响应
+
+        Returns:
+            bool: 是否正常退出；超时或连接异常时已关闭连接，需要重建
+        """
         try:
             self._idle_conn.send(b'DONE\r\n')
-            self._idle_conn.sock.settimeout(2)
-            self._idle_conn.readline()
-        except:
-            pass
+            deadline_ns = time.monotonic_ns() + 2 * 1_000_000_000
+            while True:
+                line = self._read_idle_line(deadline_ns)
+                if line is None:
+                    logger.warning("退出 IDLE 超时或连接已断开，重建连接")
+                    break
+                if self._is_idle_done(line):
+                    return True
+        except (OSError, imaplib.IMAP4.error) as e:
+            logger.warning(f"退出 IDLE 失败: {e}")
+        # 响应未读完，数据流已与命令错位，不能继续复用该连接
+        self._close_connection()
+        return False
 
-    def _handle_new_emails(self):
-        """获取并处理新邮件"""
+    def _exit_and_search(self) -> Optional[List[bytes]]:
+        """
+        退出 IDLE 并搜索未读邮件
+
+        DONE 与 UID SEARCH UNSEEN 在一次写入中发出（服务器按顺序处理），
+        之后连续读取两条命令的响应，信号到搜索结果只需一次往返。
+
+        Returns:
+            Optional[List[bytes]]: 未读邮件 UID 列表；连接异常或命令失败时为 None
+        """
+        conn = self._idle_conn
+        tag = conn._new_tag()
         try:
-            # 复用当前连接进行搜索，无需新建连接，效率最高
-            typ, data = self._idle_conn.uid('search', None, 'UNSEEN')
-            if typ != 'OK': return
-            
-            new_uids = data[0].split()
-            emails_to_process = []
-            
-            for uid in new_uids:
-                uid_str = uid.decode()
-                if uid_str not in self._processed_uids:
-                    # 使用 receive_service 解析具体邮件内容
-                    # 注意：此处建议在 ReceiveEmailsService 中增加一个支持传入 client 的方法
-                    res = self._receive_service.receive_single_email_by_uid(uid_str, client=self._idle_conn)
-                    if res:
-                        emails_to_process.append(res)
-                        self._processed_uids.add(uid_str)
+            conn.send(b'DONE\r\n' + tag + b' UID SEARCH UNSEEN\r\n')
+
+            deadline_ns = time.monotonic_ns() + 10 * 1_000_000_000
+            uids: List[bytes] = []
+            while True:
+                line = self._read_idle_line(deadline_ns)
+                if line is None:
+                    logger.warning("退出 IDLE 并搜索超时或连接已被服务器关闭")
+                    break
+                if line.startswith(b'* SEARCH'):
+                    uids.extend(line[len(b'* SEARCH'):].split())
+                elif line.startswith(tag + b' '):
+                    conn.tagged_commands.pop(tag, None)
+                    if line[len(tag) + 1:].startswith(b'OK'):
+                        return uids
+                    logger.error("搜索未读邮件失败: %r", line.rstrip())
+                    return None
+                else:
+                    # IDLE 结束的标签响应或期间到达的未标记响应
+                    self._is_idle_done(line)
+        except OSError as e:
+            logger.error(f"退出 IDLE 并搜索失败: {e}")
+        # 响应未读完，数据流已与命令错位，不能继续复用该连接
+        self._close_connection()
+        return None
+
+    def _is_idle_done(self, line: bytes) -> bool:
+        """判断是否为 IDLE 命令的标签响应，是则将该标签从 imaplib 的 tagged_commands 中移除"""
+        tag = self._idle_tag
+        if tag is None or not line.startswith(tag + b' '):
+            return False
+        self._idle_conn.tagged_commands.pop(tag, None)
+        self._idle_tag = None
+        return True
+
+    def _read_idle_line(self, deadline_ns: int) -> Optional[bytes]:
+        """
+        退出 IDLE 期间读取一行响应
+
+        与 _wait_for_signal 一样先消费 _idle_buf 中的残留，再在 selector 上等待可读后 read1，
+        不设置 Socket 超时：超时后 imaplib 的文件对象会失效，后续读取全部报错。
+
+        Args:
+            deadline_ns: time.monotonic_ns() 截止时间
+
+        Returns:
+            Optional[bytes]: 含换行符的一行；超时或连接断开时为 None
+        """
+        conn = self._idle_conn
+        buf = self._idle_buf
+        try:
+            while b'\n' not in buf:
+                if not conn.sock.pending():
+                    remaining_ns = deadline_ns - time.monotonic_ns()
+                    if remaining_ns <= 0 or not self._selector.select(remaining_ns / 1e9):
+                        return None
+                chunk = conn.file.read1(self.IDLE_READ_SIZE)
+                if not chunk:
+                    return None
+                buf += chunk
+            line, _, buf = buf.partition(b'\n')
+            return line + b'\n'
+        finally:
+            self._idle_buf = buf
+
+    def _handle_new_emails(self, uids: List[bytes]):
+        """
+        获取并处理新邮件
+
+        Args:
+            uids: UID SEARCH 返回的未读邮件 UID
+        """
+        # 初始同步完成前 _processed_uids 尚不完整，等待后再去重
+        self._sync_done.wait()
+
+        try:
+            new_uids = [uid.decode() for uid in uids]
+            new_uids = [uid for uid in new_uids if uid not in self._processed_uids]
+
+            # 一次（每 64 封一批）UID FETCH 获取全部新邮件，复用当前连接
+            emails_to_process = self._receive_service.receive_many_by_uids(new_uids, client=self._idle_conn)
+            self._remember_uids([email_msg.msg_id for email_msg in emails_to_process])
 
             if emails_to_process:
-                self._executor.submit(self.new_email_callback, emails_to_process)
-                
-            # 保持集合大小，防止内存溢出
-            if len(self._processed_uids) > 1000:
-                self._processed_uids = set(list(self._processed_uids)[-500:])
+                try:
+                    self._callback_queue.put(emails_to_process, timeout=1)
+                except queue.Full:
+                    # 背压：回调处理跟不上，阻塞等待空位（UID 已记为已处理，不能丢弃）
+                    logger.warning(f"回调队列已满（{self.CALLBACK_QUEUE_SIZE} 批），等待消费...")
+                    self._callback_queue.put(emails_to_process)
 
         except Exception as e:
             logger.error(f"提取新邮件内容失败: {e}")
 
+    def _remember_uids(self, uids: List[str]) -> None:
+        """记录已处理 UID，超出上限时按插入顺序淘汰最早的（O(1)）"""
+        # 已存在的 UID 先移到末尾（刷新顺序），其余通过一次 update 批量插入
+        processed = self._processed_uids
+        for uid in processed.keys() & set(uids):
+            processed.move_to_end(uid)
+        processed.update(dict.fromkeys(uids))
+        while len(self._processed_uids) > self.PROCESSED_UIDS_MAX:
+            self._processed_uids.popitem(last=False)
+
     def _close_connection(self):
+        if self._selector:
+            self._selector.close()
+            self._selector = None
         if self._idle_conn:
             try:
                 self._idle_conn.logout()
-            except:
+            except (OSError, imaplib.IMAP4.error):
                 pass
             self._idle_conn = None
+        self._idle_buf = b''
+        self._idle_tag = None
 
     def _initial_sync(self):
         """启动时的初始同步"""
@@ -264,8 +574,9 @@ class EmailListenerIdle:
         try:
             res = self._receive_service.receive_unread_emails(count=self.config.initial_sync_count)
             if res['success']:
-                for m in res['emails']:
-                    self._processed_uids.add(str(m.msg_id))
+                self._remember_uids([str(m.msg_id) for m in res['emails']])
                 logger.info(f"初始同步完成，已忽略 {len(res['emails'])} 封旧邮件")
         except Exception as e:
-            logger.error(f"初始同步异常: {e}")
\ No newline at end of file
+            logger.error(f"初始同步异常: {e}")
+        finally:
+            self._sync_done.set()
\ No newline at end of file
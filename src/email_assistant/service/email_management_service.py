@@ -18,12 +18,93 @@
 """
 
 import logging
-from typing import Union, List, Dict, Any, Optional
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Union, List, Dict, Any, Optional, Tuple
 from .email_client import IMAPClient, create_imap_client
 
 logger = logging.getLogger(__name__)
 
 
+# 空闲连接超过该秒数后由清理线程关闭
+_POOL_IDLE_TIMEOUT = 300
+_POOL_SWEEP_INTERVAL = 60
+
+# 已认证 IMAPClient 连接池：配置文件路径 -> [(客户端, 归还时间)]（后进先出）
+_POOL: Dict[Optional[str], "queue.LifoQueue[Tuple[IMAPClient, float]]"] = {}
+_pool_lock = threading.Lock()
+_sweeper_thread: Optional[threading.Thread] = None
+
+
+def _acquire_client(config_path: Optional[str]) -> IMAPClient:
+    """从连接池取出一个客户端，池中没有时新建"""
+    with _pool_lock:
+        pool = _POOL.setdefault(config_path, queue.LifoQueue())
+    try:
+        client, _ = pool.get_nowait()
+        logger.debug("复用连接池中的 IMAP 客户端")
+        return client
+    except queue.Empty:
+        return IMAPClient(config_path)
+
+
+def _release_client(config_path: Optional[str], client: IMAPClient) -> None:
+    """连接仍然有效时放回连接池，否则关闭"""
+    global _sweeper_thread
+
+    healthy = False
+    with client._lock:
+        if client._connection is not None:
+            try:
+                healthy = client._connection.noop()[0] == 'OK'
+            except Exception:
+                healthy = False
+    if not healthy:
+        client.close()
+        return
+
+    with _pool_lock:
+        _POOL.setdefault(config_path, queue.LifoQueue()).put((client, time.monotonic()))
+        if _sweeper_thread is None or not _sweeper_thread.is_alive():
+            _sweeper_thread = threading.Thread(
+                target=_sweep_idle_clients,
+                name="IMAPPoolSweeper",
+                daemon=True
+            )
+            _sweeper_thread.start()
+
+
+def _sweep_idle_clients() -> None:
+    """定期关闭空闲超过 _POOL_IDLE_TIMEOUT 的连接"""
+    while True:
+        time.sleep(_POOL_SWEEP_INTERVAL)
+        deadline = time.monotonic() - _POOL_IDLE_TIMEOUT
+        with _pool_lock:
+            pools = list(_POOL.values())
+        for pool in pools:
+            keep = []
+            while True:
+                try:
+                    client, released_at = pool.get_nowait()
+                except queue.Empty:
+                    break
+                if released_at < deadline:
+                    client.close()
+                    logger.info("已关闭空闲的 IMAP 连接")
+                else:
+                    keep.append((client, released_at))
+            # 按原顺序放回，保持后进先出
+            for item in keep:
+                pool.put(item)
+
+
+def _normalize_ids(msg_ids: Union[str, List[str]]) -> List[str]:
+    """将单个邮件 ID 或 ID 列表统一为列表"""
+    return [msg_ids] if isinstance(msg_ids, (str, bytes)) else list(msg_ids)
+
+
 class EmailManagementService:
     """
     邮件管理服务类
@@ -44,8 +125,20 @@ class EmailManagementService:
         # 方式2：使用上下文管理器（推荐）
         with EmailManagementService() as service:
             result = service.mark_as_read(msg_id)
+
+        # 已认证的连接在 close() 时归还到模块级连接池，下一个实例直接复用，
+        # 无需重新握手和登录；空闲超过 5 分钟的连接会被自动关闭
+
+        # 批量模式：块内的标记操作合并为尽量少的 STORE 命令，退出时一次性提交
+        with service.batching():
+            service.mark_as_read(id1)
+            service.mark_as_starred(id1)
+            service.mark_as_read(id2)
     """
 
+    # 单条 STORE 命令最多包含的邮件数
+    MAX_BATCH = 64
+
     def __init__(self, config_path: Optional[str] = None):
         """
         初始化邮件管理服务
@@ -53,9 +146,222 @@ class EmailManagementService:
         Args:
             config_path: 配置文件路径
         """
-        self.client = IMAPClient(config_path)
+        self._config_path = config_path
+        self._released = False
+        self.client = _acquire_client(config_path)
+        # batching() 块内收集的标记操作，None 表示未处于批量模式
+        self._pending_ops: Optional[List[Tuple[str, List[str], str, str]]] = None
+        self.last_batch_result: Optional[Dict[str, Any]] = None
         logger.info("EmailManagementService 初始化完成")
 
+    def _store(
+        self,
+        msg_ids: Union[str, List[str]],
+        flag_command: str,
+        flags: str,
+        folder: str
+    ) -> Dict[str, Any]:
+        """
+        设置标志；处于 batching() 块内时只加入队列，退出块时统一提交
+
+        Returns:
+            Dict: 操作结果（入队时 'queued' 为 True）
+        """
+        if self._pending_ops is None:
+            return self.client.store_flags(
+                msg_ids=msg_ids,
+                flag_command=flag_command,
+                flags=flags,
+                folder=folder
+            )
+
+        ids = _normalize_ids(msg_ids)
+        self._pending_ops.append((flag_command, ids, flags, folder))
+        return {
+            'success': True,
+            'queued': True,
+            'count': len(ids),
+            'msg_ids': ids,
+            'message': f'已加入批量队列: {flag_command} {flags}'
+        }
+
+    def _run_flag_op(
+        self,
+        flag_command: str,
+        flags: str,
+        msg_ids: Union[str, List[str]],
+        folder: str,
+        action: str,
+        success_message: str
+    ) -> Dict[str, Any]:
+        """
+        执行一次标记操作（各 mark_* 方法的公共实现）
+
+        Args:
+            flag_command: 标志命令，如 '+FLAGS'
+            flags: 标志值，如 '\\Seen'
+            msg_ids: 单个邮件 ID 或邮件 ID 列表
+            folder: 文件夹名称
+            action: 操作名称，用于日志和错误信息，如 '标记已读'
+            success_message: 成功消息模板，{count} 替换为邮件数
+
+        Returns:
+            Dict: 操作结果
+        """
+        ids = _normalize_ids(msg_ids)
+        try:
+            logger.info(f"正在{action}: {len(ids)} 封邮件")
+
+            result = self._store(ids, flag_command, flags, folder)
+
+            if result['success'] and not result.get('queued'):
+                result['message'] = success_message.format(count=result['count'])
+                logger.info(result['message'])
+
+            return result
+
+        except Exception as e:
+            logger.error(f"{action}失败: {str(e)}")
+            return {
+                'success': False,
+                'error': str(e),
+                'message': f'{action}失败: {str(e)}'
+            }
+
+    def batch(self, ops: List[Tuple[str, Union[str, List[str]], str]]) -> Dict[str, Any]:
+        """
+        批量执行多个标记操作，合并为尽量少的 STORE 命令
+
+        相同 (文件夹, 命令, 标志集合) 的操作合并为一条命令（每条最多 MAX_BATCH 封）。
+        合并按单个标志判断先后关系：中间有其他操作涉及其中任一标志时（如先 +FLAGS 再 -FLAGS），
+        不再合并到前面的分组，保持原有先后顺序；FLAGS（整体替换）命令作为分界，不与前面的操作合并。
+
+        Args:
+            ops: 操作列表，每项为 (flag_command, msg_ids, flags) 或
+                 (flag_command, msg_ids, flags, folder)，folder 默认 'INBOX'
+
+        Returns:
+            Dict: 操作结果
+                {
+                    'success': True,
+                    'count': 3,
+                    'commands': 2,
+                    'message': '批量操作完成: 2 条命令，3 封邮件'
+                }
+
+        示例：
+            result = service.batch([
+                ('+FLAGS', ['123', '124'], '\\Seen'),
+                ('+FLAGS', '123', '\\Flagged'),
+                ('+FLAGS', '125', '\\Seen'),
+            ])
+        """
+        groups: List[Dict[str, Any]] = []
+        # (文件夹, 命令, 标志集合) -> 可合并的最近分组下标
+        same_op_group: Dict[Tuple[str, str, frozenset], int] = {}
+        # (文件夹, 单个标志) -> 最近一个涉及该标志的分组下标
+        last_touch: Dict[Tuple[str, str], int] = {}
+        # 文件夹 -> 最近一个 FLAGS 分组下标（之前的分组不能再合并）
+        barrier: Dict[str, int] = {}
+
+        for op in ops:
+            flag_command, msg_ids, flags = op[:3]
+            folder = op[3] if len(op) > 3 else 'INBOX'
+            ids = _normalize_ids(msg_ids)
+            command = flag_command.upper()
+            # IMAP 标志不区分大小写
+            flag_set = frozenset(flag.lower() for flag in flags.strip('()').split())
+            key = (folder, command, flag_set)
+
+            idx = same_op_group.get(key)
+            if (
+                command != 'FLAGS'
+                and idx is not None
+                and idx > barrier.get(folder, -1)
+                # 该分组之后没有其他操作涉及这些标志，合并不会改变先后顺序
+                and all(last_touch.get((folder, flag), -1) <= idx for flag in flag_set)
+            ):
+                groups[idx]['msg_ids'].extend(ids)
+            else:
+                groups.append({
+                    'folder': folder,
+                    'flag_command': flag_command,
+                    'flags': flags,
+                    'msg_ids': ids
+                })
+                idx = len(groups) - 1
+                same_op_group[key] = idx
+                if command == 'FLAGS':
+                    barrier[folder] = idx
+            for flag in flag_set:
+                last_touch[(folder, flag)] = idx
+
+        total = 0
+        commands = 0
+        errors = []
+        for group in groups:
+            msg_ids = list(dict.fromkeys(group['msg_ids']))
+            for start in range(0, len(msg_ids), self.MAX_BATCH):
+                result = self.client.store_flags(
+                    msg_ids=msg_ids[start:start + self.MAX_BATCH],
+                    flag_command=group['flag_command'],
+                    flags=group['flags'],
+                    folder=group['folder']
+                )
+                commands += 1
+                if result['success']:
+                    total += result['count']
+                else:
+                    errors.append(result.get('message', '未知错误'))
+
+        message = f"批量操作完成: {commands} 条命令，{total} 封邮件"
+        if errors:
+            logger.error(f"批量操作部分失败: {errors}")
+        else:
+            logger.info(message)
+
+        return {
+            'success': not errors,
+            'count': total,
+            'commands': commands,
+            'errors': errors,
+            'message': message
+        }
+
+    @contextmanager
+    def batching(self):
+        """
+        批量模式上下文：块内的标记操作只入队，退出时通过 batch() 一次性提交
+
+        提交结果保存在 last_batch_result 中。块内调用不能入队的操作（永久删除、移动、复制、搜索）时，
+        会先提交已入队的操作再执行，保持调用顺序。
+
+        示例：
+            with service.batching():
+                service.mark_as_read(['123', '124'])
+                service.mark_as_starred('123')
+            print(service.last_batch_result)
+        """
+        if self._pending_ops is not None:
+            # 已在批量模式中（嵌套），由最外层统一提交
+            yield self
+            return
+
+        self._pending_ops = []
+        self.last_batch_result = None
+        try:
+            yield self
+        finally:
+            ops, self._pending_ops = self._pending_ops, None
+            if ops:
+                self.last_batch_result = self.batch(ops)
+
+    def _flush_pending(self) -> None:
+        """批量模式下先提交已入队的标记操作（在不能入队的操作之前调用，保持先后顺序）"""
+        if self._pending_ops:
+            ops, self._pending_ops = self._pending_ops, []
+            self.last_batch_result = self.batch(ops)
+
     def mark_as_read(
         self,
         msg_ids: Union[str, List[str]],
@@ -84,29 +390,7 @@ class EmailManagementService:
             # 批量标记
             result = service.mark_as_read(['12345', '12346', '12347'])
         """
-        try:
-            logger.info(f"正在标记 {len(msg_ids) if isinstance(msg_ids, list) else 1} 封邮件为已读")
-
-            result = self.client.store_flags(
-                msg_ids=msg_ids,
-                flag_command='+FLAGS',
-                flags='\\Seen',
-                folder=folder
-            )
-
-            if result['success']:
-                result['message'] = f"成功标记 {result['count']} 封邮件为已读"
-                logger.info(result['message'])
-
-            return result
-
-        except Exception as e:
-            logger.error(f"标记已读失败: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e),
-                'message': f'标记已读失败: {str(e)}'
-            }
+        return self._run_flag_op('+FLAGS', '\\Seen', msg_ids, folder, '标记已读', '成功标记 {count} 封邮件为已读')
 
     def mark_as_unread(
         self,
@@ -126,29 +410,7 @@ class EmailManagementService:
         示例：
             result = service.mark_as_unread(['12345', '12346'])
         """
-        try:
-            logger.info(f"正在标记 {len(msg_ids) if isinstance(msg_ids, list) else 1} 封邮件为未读")
-
-            result = self.client.store_flags(
-                msg_ids=msg_ids,
-                flag_command='-FLAGS',
-                flags='\\Seen',
-                folder=folder
-            )
-
-            if result['success']:
-                result['message'] = f"成功标记 {result['count']} 封邮件为未读"
-                logger.info(result['message'])
-
-            return result
-
-        except Exception as e:
-            logger.error(f"标记未读失败: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e),
-                'message': f'标记未读失败: {str(e)}'
-            }
+        return self._run_flag_op('-FLAGS', '\\Seen', msg_ids, folder, '标记未读', '成功标记 {count} 封邮件为未读')
 
     def mark_as_starred(
         self,
@@ -168,29 +430,7 @@ class EmailManagementService:
         示例：
             result = service.mark_as_starred('12345')
         """
-        try:
-            logger.info(f"正在标记 {len(msg_ids) if isinstance(msg_ids, list) else 1} 封邮件为星标")
-
-            result = self.client.store_flags(
-                msg_ids=msg_ids,
-                flag_command='+FLAGS',
-                flags='\\Flagged',
-                folder=folder
-            )
-
-            if result['success']:
-                result['message'] = f"成功标记 {result['count']} 封邮件为星标"
-                logger.info(result['message'])
-
-            return result
-
-        except Exception as e:
-            logger.error(f"标记星标失败: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e),
-                'message': f'标记星标失败: {str(e)}'
-            }
+        return self._run_flag_op('+FLAGS', '\\Flagged', msg_ids, folder, '标记星标', '成功标记 {count} 封邮件为星标')
 
     def remove_starred(
         self,
@@ -207,29 +447,7 @@ class EmailManagementService:
         Returns:
             Dict: 操作结果
         """
-        try:
-            logger.info(f"正在移除 {len(msg_ids) if isinstance(msg_ids, list) else 1} 封邮件的星标")
-
-            result = self.client.store_flags(
-                msg_ids=msg_ids,
-                flag_command='-FLAGS',
-                flags='\\Flagged',
-                folder=folder
-            )
-
-            if result['success']:
-                result['message'] = f"成功移除 {result['count']} 封邮件的星标"
-                logger.info(result['message'])
-
-            return result
-
-        except Exception as e:
-            logger.error(f"移除星标失败: {str(e)}")
-            return {
-                'success': False,
-                'error': str(e),
-                'message': f'移除星标失败: {str(e)}'
-            }
+        return self._run_flag_op('-FLAGS', '\\Flagged', msg_ids, folder, '移除星标', '成功移除 {count} 封邮件的星标')
 
     def delete_emails(
         self,
@@ -259,35 +477,28 @@ class EmailManagementService:
             # 永久删除
             result = service.delete_emails('12345', permanent=True)
         """
-        try:
-            logger.info(f"正在删除 {len(msg_ids) if isinstance(msg_ids, list) else 1} 封邮件（永久={permanent}）")
+        if not permanent:
+            # 移到回收站：只标记删除（批量模式下入队）
+            return self._run_flag_op('+FLAGS', '\\Deleted', msg_ids, folder, '删除邮件', '成功将 {count} 封邮件移到回收站')
 
-            if permanent:
-                # 永久删除：先标记删除，再执行 expunge
-                result = self.client.store_flags(
-                    msg_ids=msg_ids,
-                    flag_command='+FLAGS',
-                    flags='\\Deleted',
-                    folder=folder
-                )
+        ids = _normalize_ids(msg_ids)
+        try:
+            self._flush_pending()
+            logger.info(f"正在删除 {len(ids)} 封邮件（永久={permanent}）")
 
-                if result['success']:
-                    # 执行永久删除
-                    self.client.connection.expunge()
-                    result['message'] = f"成功永久删除 {result['count']} 封邮件"
-                    logger.info(result['message'])
-            else:
-                # 移到回收站：先标记删除
-                result = self.client.store_flags(
-                    msg_ids=msg_ids,
-                    flag_command='+FLAGS',
-                    flags='\\Deleted',
-                    folder=folder
-                )
+            # 永久删除：先标记删除，再执行 expunge
+            result = self.client.store_flags(
+                msg_ids=ids,
+                flag_command='+FLAGS',
+                flags='\\Deleted',
+                folder=folder
+            )
 
-                if result['success']:
-                    result['message'] = f"成功将 {result['count']} 封邮件移到回收站"
-                    logger.info(result['message'])
+            if result['success']:
+                # 执行永久删除
+                self.client.connection.expunge()
+                result['message'] = f"成功永久删除 {result['count']} 封邮件"
+                logger.info(result['message'])
 
             return result
 
@@ -323,11 +534,13 @@ class EmailManagementService:
             # 批量移动到工作文件夹
             result = service.move_to_folder(['12345', '12346'], 'Work')
         """
+        ids = _normalize_ids(msg_ids)
         try:
-            logger.info(f"正在移动 {len(msg_ids) if isinstance(msg_ids, list) else 1} 封邮件到 {dest_folder}")
+            self._flush_pending()
+            logger.info(f"正在移动 {len(ids)} 封邮件到 {dest_folder}")
 
             result = self.client.move_email(
-                msg_ids=msg_ids,
+                msg_ids=ids,
                 dest_folder=dest_folder,
                 folder=folder
             )
@@ -366,11 +579,13 @@ class EmailManagementService:
             # 复制到备份文件夹
             result = service.copy_to_folder('12345', 'Backup')
         """
+        ids = _normalize_ids(msg_ids)
         try:
-            logger.info(f"正在复制 {len(msg_ids) if isinstance(msg_ids, list) else 1} 封邮件到 {dest_folder}")
+            self._flush_pending()
+            logger.info(f"正在复制 {len(ids)} 封邮件到 {dest_folder}")
 
             result = self.client.copy_email(
-                msg_ids=msg_ids,
+                msg_ids=ids,
                 dest_folder=dest_folder,
                 folder=folder
             )
@@ -484,6 +699,7 @@ class EmailManagementService:
             result = service.search_emails('FLAGGED')
         """
         try:
+            self._flush_pending()
             email_ids = self.client.search_emails(criteria=criteria, folder=folder)
 
             return {
@@ -504,8 +720,11 @@ class EmailManagementService:
             }
 
     def close(self):
-        """关闭服务连接"""
-        self.client.close()
+        """释放服务连接（连接有效时归还到连接池复用）"""
+        if self._released:
+            return
+        self._released = True
+        _release_client(self._config_path, self.client)
 
     def __enter__(self):
         """上下文管理器入口"""
@@ -516,10 +735,6 @@ class EmailManagementService:
         self.close()
 
 
-# 创建全局实例（可选，但不推荐使用全局实例）
-# email_management_service = EmailManagementService()
-
-
 if __name__ == "__main__":
     """测试代码"""
     import json
@@ -9,24 +9,191 @@ QQ邮件接收服务（重构版）
 """
 
 import email
+import imaplib
 import logging
+import queue
+import threading
+from contextlib import contextmanager
 from email.header import decode_header
-from typing import List, Dict, Any, Optional, Union
-from datetime import datetime
+from email.parser import BytesHeaderParser, BytesParser
+from datetime import timezone
+from functools import lru_cache
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Dict, Any, Optional, Tuple, Union
 import chardet
-from .email_client import IMAPClient
+from .email_client import IMAPClient, _compress_uid_set, _parse_fetch_response
 
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# 完整邮件解析器（compat32 策略，与 email.message_from_bytes 一致；无状态，可跨线程复用）
+_BYTES_PARSER = BytesParser()
+
+# 只解析邮件头的解析器（不构建 MIME 树，不解码附件）
+_HEADER_PARSER = BytesHeaderParser()
+
+# 短于该长度的片段统计特征不足，chardet 检测不可靠，直接按 UTF-8 解码
+_CHARDET_MIN_LENGTH = 32
+
+
+@lru_cache(maxsize=1024)
+def _decode_unknown_charset(content: bytes) -> str:
+    """
+    解码未声明编码的邮件头片段
+
+    纯 ASCII 和合法 UTF-8 直接解码，只有其余情况才调用 chardet；
+    同一批邮件中重复出现的片段（如相同发件人）命中缓存。
+
+    Args:
+        content: 邮件头片段字节数据
+
+    Returns:
+        str: 解码后的字符串
+    """
+    if content.isascii():
+        return content.decode('ascii')
+    try:
+        return content.decode('utf-8')
+    except UnicodeDecodeError:
+        pass
+    if len(content) < _CHARDET_MIN_LENGTH:
+        return content.decode('utf-8', errors='ignore')
+    detected = chardet.detect(content)
+    return content.decode(detected['encoding'] or 'utf-8', errors='ignore')
+
+
+def _decode_header(header_value: Any) -> str:
+    """
+    解码邮件头（RFC 2047 编码字）
+
+    Args:
+        header_value: 邮件头字符串或 email.header.Header 对象
+
+    Returns:
+        str: 解码后的字符串
+    """
+    try:
+        decoded_parts = decode_header(header_value)
+        result = ""
+        for content, encoding in decoded_parts:
+            if isinstance(content, bytes):
+                if encoding:
+                    result += content.decode(encoding)
+                else:
+                    # 如果没有指定编码，尝试检测
+                    result += _decode_unknown_charset(content)
+            else:
+                result += str(content)
+        return result
+    except Exception as e:
+        logger.warning("解码邮件头失败: %s", e)
+        if isinstance(header_value, bytes):
+            return header_value.decode('utf-8', errors='ignore')
+        return str(header_value)
+
+
+# 字符串邮件头的解码结果缓存（Header 对象不可哈希，不走缓存）
+_decode_header_cached = lru_cache(maxsize=512)(_decode_header)
+
+
+@lru_cache(maxsize=256)
+def _format_date(date_header: str) -> str:
+    """
+    将 Date 邮件头格式化为本地时间字符串（相同的 Date 头命中缓存）
+
+    Args:
+        date_header: Date 邮件头原始值
+
+    Returns:
+        str: 'YYYY-mm-dd HH:MM:SS' 格式的本地时间，无法解析时原样返回
+    """
+    if not date_header:
+        return date_header
+    try:
+        dt = email.utils.parsedate_to_datetime(date_header)
+    except (TypeError, ValueError):
+        return date_header
+    if dt.tzinfo is None:
+        # "-0000" 和不带时区的 Date 头按 UTC 处理，再转换为本地时间
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone().strftime('%Y-%m-%d %H:%M:%S')
+
+
+# _parse_headers 使用的单值邮件头（小写）
+_WANTED_HEADERS = frozenset(('subject', 'from', 'to', 'date'))
+
+
+def _collect_headers(msg: email.message.Message) -> Dict[str, Any]:
+    """
+    一次遍历邮件头列表，收集 Subject / From / To / Date（取首个）和全部 Cc
+
+    Args:
+        msg: email.message.Message 对象
+
+    Returns:
+        Dict: 小写头名 -> 值；'cc' 始终存在，为字符串列表
+    """
+    collected: Dict[str, Any] = {'cc': []}
+    for name, value in msg.items():
+        lower = name.lower()
+        if lower == 'cc':
+            collected['cc'].append(str(value))
+        elif lower in _WANTED_HEADERS and lower not in collected:
+            collected[lower] = value
+    return collected
+
+
+def _estimate_payload_size(part: email.message.Message) -> int:
+    """
+    估算 MIME 部分解码后的字节数，不解码附件内容
+
+    优先使用 Content-Length 头；base64 按编码长度 × 3/4 减去填充计算，
+    quoted-printable 按每个转义序列折算，其余编码直接取原始长度。
+
+    Args:
+        part: 附件 MIME 部分
+
+    Returns:
+        int: 附件大小（字节）
+    """
+    content_length = part.get('Content-Length')
+    if content_length:
+        try:
+            return int(content_length)
+        except ValueError:
+            pass
+
+    raw = part.get_payload()
+    if not isinstance(raw, str):
+        # 嵌套消息等非文本负载，退回到解码后计算
+        return len(part.get_payload(decode=True) or b'')
+
+    cte = part.get('Content-Transfer-Encoding', '').strip().lower()
+    if cte == 'base64':
+        stripped = raw.rstrip()
+        padding = len(stripped) - len(stripped.rstrip('='))
+        encoded_len = len(raw) - raw.count('\n') - raw.count('\r') - raw.count(' ')
+        return max(0, encoded_len * 3 // 4 - padding)
+    if cte == 'quoted-printable':
+        # =XX 解码为 1 字节；软换行 "=\n" / "=\r\n" 不产生内容
+        return max(0, len(raw) - 2 * raw.count('=') - raw.count('=\r\n'))
+    return len(raw)
+
 
 class EmailMessage:
-    """邮件消息类"""
+    """
+    邮件消息类
+
+    传入 lazy_loader 时，body / body_type / attachments / raw_email 会在首次访问时才解析，
+    loader 返回包含这四个键的字典。
+    """
+
+    # 批量接收时会创建大量实例，使用 __slots__ 省去每个实例的 __dict__
+    __slots__ = (
+        'msg_id', 'subject', 'from_email', 'from_name', 'to_email', 'date', 'cc', 'bcc',
+        '_body', '_body_type', '_attachments', '_raw_email', '_lazy_loader',
+    )
 
     def __init__(
         self,
@@ -41,7 +208,8 @@ class EmailMessage:
         cc: List[str] = None,
         bcc: List[str] = None,
         attachments: List[Dict[str, Any]] = None,
-        raw_email: Any = None
+        raw_email: Any = None,
+        lazy_loader: Optional[Callable[[], Dict[str, Any]]] = None
     ):
         self.msg_id = msg_id
         self.subject = subject
@@ -55,6 +223,55 @@ class EmailMessage:
         self.bcc = bcc or []
         self.attachments = attachments or []
         self.raw_email = raw_email
+        self._lazy_loader = lazy_loader
+
+    def _ensure_loaded(self) -> None:
+        """首次访问正文相关字段时执行完整解析"""
+        loader = self._lazy_loader
+        if loader is None:
+            return
+        self._lazy_loader = None
+        loaded = loader()
+        self._body = loaded['body']
+        self._body_type = loaded['body_type']
+        self._attachments = loaded['attachments']
+        self._raw_email = loaded['raw_email']
+
+    @property
+    def body(self) -> str:
+        self._ensure_loaded()
+        return self._body
+
+    @body.setter
+    def body(self, value: str) -> None:
+        self._body = value
+
+    @property
+    def body_type(self) -> str:
+        self._ensure_loaded()
+        return self._body_type
+
+    @body_type.setter
+    def body_type(self, value: str) -> None:
+        self._body_type = value
+
+    @property
+    def attachments(self) -> List[Dict[str, Any]]:
+        self._ensure_loaded()
+        return self._attachments
+
+    @attachments.setter
+    def attachments(self, value: List[Dict[str, Any]]) -> None:
+        self._attachments = value
+
+    @property
+    def raw_email(self) -> Any:
+        self._ensure_loaded()
+        return self._raw_email
+
+    @raw_email.setter
+    def raw_email(self, value: Any) -> None:
+        self._raw_email = value
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -96,237 +313,389 @@ class ReceiveEmailsService:
             result = service.receive_latest_emails(count=10)
     """
 
-    def __init__(self, config_path: Optional[str] = None):
+    # 并行解析邮件的最大线程数
+    PARSE_MAX_WORKERS = 8
+    # 默认最大并发 IMAP 连接数（多数服务器限制单账号 5~15 个并发连接）
+    MAX_CONNECTIONS = 5
+
+    def __init__(self, config_path: Optional[str] = None, max_connections: Optional[int] = None):
         """
         初始化邮件接收服务
 
         Args:
             config_path: 配置文件路径
+            max_connections: 最大并发 IMAP 连接数，默认 MAX_CONNECTIONS
         """
-        # 使用 IMAPClient 进行连接管理
+        self._config_path = config_path
+
+        # 使用 IMAPClient 进行连接管理；self.client 是连接池中的第一个连接
         self.client = IMAPClient(config_path)
+
+        # 连接池：并发调用各自使用一个连接，不再在同一连接上排队（连接惰性建立）
+        self._idle_clients: "queue.LifoQueue[IMAPClient]" = queue.LifoQueue()
+        self._idle_clients.put(self.client)
+        self._all_clients: List[IMAPClient] = [self.client]
+        self._clients_lock = threading.Lock()
+        self._client_slots = threading.BoundedSemaphore(max_connections or self.MAX_CONNECTIONS)
+
         logger.info("ReceiveEmailsService 初始化完成（使用 IMAPClient）")
 
-    def _decode_header_value(self, header_value: bytes) -> str:
+    @contextmanager
+    def _acquire_client(self) -> Iterator[IMAPClient]:
+        """
+        从连接池借出一个 IMAPClient，用完自动归还；连接数达到上限时等待
+
+        Yields:
+            IMAPClient: 独占使用的客户端
+        """
+        self._client_slots.acquire()
+        try:
+            try:
+                client = self._idle_clients.get_nowait()
+            except queue.Empty:
+                client = IMAPClient(self._config_path)
+                with self._clients_lock:
+                    self._all_clients.append(client)
+                logger.debug("连接池新建 IMAP 客户端，当前共 %d 个", len(self._all_clients))
+            try:
+                yield client
+            finally:
+                self._idle_clients.put(client)
+        finally:
+            self._client_slots.release()
+
+    def _decode_header_value(self, header_value: Any) -> str:
         """
         解码邮件头
 
         Args:
-            header_value: 邮件头字节数据
+            header_value: 邮件头字符串或 email.header.Header 对象
 
         Returns:
             str: 解码后的字符串
         """
-        if header_value is None:
+        if not header_value:
             return ""
 
-        try:
-            decoded_parts = decode_header(header_value)
-            result = ""
-            for content, encoding in decoded_parts:
-                if isinstance(content, bytes):
-                    if encoding:
-                        result += content.decode(encoding)
-                    else:
-                        # 如果没有指定编码，尝试检测
-                        detected = chardet.detect(content)
-                        result += content.decode(detected['encoding'] or 'utf-8', errors='ignore')
-                else:
-                    result += str(content)
-            return result
-        except Exception as e:
-            logger.warning(f"解码邮件头失败: {str(e)}")
-            return str(header_value)
+        if isinstance(header_value, str):
+            # 同一批邮件中重复的发件人、主题前缀直接命中缓存
+            return _decode_header_cached(header_value)
+        return _decode_header(header_value)
 
     def _extract_email_address(self, addr_str: str) -> tuple:
         """
         从地址字符串中提取邮箱和名称
 
         Args:
-            addr_str: 地址字符串，格式如 "Name <email@example.com>" 或 "email@example.com"
+            addr_str: 原始地址头，格式如 "Name <email@example.com>" 或 "email@example.com"（名称可为 RFC 2047 编码）
 
         Returns:
-            tuple: (name, email_address)
+            tuple: (name, email_address)；包含多个地址时取第一个
         """
-        try:
-            # 格式可能是: "Name <email@example.com>" 或 "email@example.com"
-            if '<' in addr_str and '>' in addr_str:
-                name = addr_str[:addr_str.index('<')].strip().strip('"')
-                email_addr = addr_str[addr_str.index('<') + 1:addr_str.index('>')].strip()
-                return name, email_addr
-            else:
-                return "", addr_str.strip()
-        except Exception:
-            return "", addr_str
+        # parseaddr 遇到多个地址会返回空值，这里用 getaddresses 拆分后取第一个
+        for name, email_addr in email.utils.getaddresses([addr_str]):
+            if email_addr:
+                return self._decode_header_value(name), email_addr
+        return "", addr_str.strip()
 
-    def _get_email_body(self, msg: email.message.Message) -> tuple:
+    def _decode_text_part(self, part: email.message.Message) -> str:
         """
-        获取邮件正文
+        解码文本部分的内容
 
         Args:
-            msg: email.message.Message 对象
+            part: 文本 MIME 部分
 
         Returns:
-            tuple: (body_content, body_type) - 正文内容和类型
+            str: 解码后的文本
         """
-        body = ""
-        body_type = "plain"
-
-        try:
-            # 优先获取HTML正文
-            if msg.is_multipart():
-                for part in msg.walk():
-                    content_type = part.get_content_type()
-                    content_disposition = str(part.get("Content-Disposition", ""))
-
-                    # 跳过附件
-                    if "attachment" in content_disposition:
-                        continue
-
-                    # 优先使用HTML
-                    if content_type == "text/html" and not body:
-                        try:
-                            payload = part.get_payload(decode=True)
-                            charset = part.get_content_charset() or 'utf-8'
-                            body = payload.decode(charset, errors='ignore')
-                            body_type = "html"
-                        except Exception:
-                            pass
-
-                    # 如果没有HTML，使用纯文本
-                    elif content_type == "text/plain" and not body:
-                        try:
-                            payload = part.get_payload(decode=True)
-                            charset = part.get_content_charset() or 'utf-8'
-                            body = payload.decode(charset, errors='ignore')
-                            body_type = "plain"
-                        except Exception:
-                            pass
-            else:
-                # 非多部分邮件
-                try:
-                    payload = msg.get_payload(decode=True)
-                    charset = msg.get_content_charset() or 'utf-8'
-                    body = payload.decode(charset, errors='ignore')
-                    content_type = msg.get_content_type()
-                    body_type = "html" if "html" in content_type else "plain"
-                except Exception:
-                    body = str(msg.get_payload())
-
-        except Exception as e:
-            logger.error(f"获取邮件正文失败: {str(e)}")
-
-        return body, body_type
+        payload = part.get_payload(decode=True)
+        charset = part.get_content_charset() or 'utf-8'
+        return payload.decode(charset, errors='ignore')
 
-    def _extract_attachments(self, msg: email.message.Message) -> List[Dict[str, Any]]:
+    def _walk_and_classify(self, msg: email.message.Message) -> Tuple[str, str, List[Dict[str, Any]]]:
         """
-        提取附件信息
+        单次遍历 MIME 树，同时提取邮件正文和附件信息
 
         Args:
             msg: email.message.Message 对象
 
         Returns:
-            List[Dict]: 附件信息列表
+            tuple: (body_content, body_type, attachments) - 正文内容、类型和附件信息列表
         """
+        body = ""
+        body_type = "plain"
         attachments = []
+        # 正文候选部分：遍历时只记录，遍历结束后只解码选中的一个
+        html_part = None
+        plain_part = None
 
         try:
+            if not msg.is_multipart():
+                # 非多部分邮件
+                try:
+                    body = self._decode_text_part(msg)
+                    body_type = "html" if "html" in msg.get_content_type() else "plain"
+                except Exception:
+                    body = str(msg.get_payload())
+
             for part in msg.walk():
                 content_disposition = str(part.get("Content-Disposition", ""))
 
                 if "attachment" in content_disposition:
                     filename = part.get_filename()
                     if filename:
-                        filename = self._decode_header_value(filename)
-                        file_size = len(part.get_payload(decode=True) or b'')
+                        try:
+                            attachments.append({
+                                'filename': self._decode_header_value(filename),
+                                'size': _estimate_payload_size(part),
+                                'content_type': part.get_content_type(),
+                            })
+                        except Exception as e:
+                            logger.warning("提取附件信息失败: %s", e)
+                    continue
 
-                        attachments.append({
-                            'filename': filename,
-                            'size': file_size,
-                            'content_type': part.get_content_type(),
-                        })
+                if part is msg:
+                    continue
+
+                content_type = part.get_content_type()
+                if content_type == "text/html":
+                    if html_part is None:
+                        html_part = part
+                elif content_type == "text/plain":
+                    if plain_part is None:
+                        plain_part = part
+
+            # 优先使用 HTML，没有（或解码为空）时使用纯文本
+            for part, part_type in ((html_part, "html"), (plain_part, "plain")):
+                if body or part is None:
+                    continue
+                try:
+                    body = self._decode_text_part(part)
+                    body_type = part_type
+                except Exception:
+                    pass
 
         except Exception as e:
-            logger.warning(f"提取附件信息失败: {str(e)}")
+            logger.error("解析邮件正文失败: %s", e)
 
-        return attachments
+        return body, body_type, attachments
 
-    def _parse_email_message(self, msg: email.message.Message, msg_id: str) -> EmailMessage:
+    def _parse_email_message(
+        self,
+        msg: email.message.Message,
+        msg_id: str,
+        keep_raw: bool = False
+    ) -> EmailMessage:
         """
         解析邮件消息为 EmailMessage 对象
 
         Args:
             msg: email.message.Message 对象
             msg_id: 邮件 ID
+            keep_raw: 是否在结果中保留解析后的完整 Message（raw_email）
 
         Returns:
             EmailMessage: 解析后的邮件对象
         """
         try:
-            # 解析邮件头
-            subject = self._decode_header_value(msg.get('Subject', ''))
-            from_header = self._decode_header_value(msg.get('From', ''))
-            to_header = self._decode_header_value(msg.get('To', ''))
-            date_header = msg.get('Date', '')
-            cc_header = self._decode_header_value(msg.get('Cc', ''))
-
-            # 提取发件人信息
-            from_name, from_email = self._extract_email_address(from_header)
-
-            # 提取收件人信息
-            _, to_email = self._extract_email_address(to_header)
-
-            # 解析抄送
-            cc_list = []
-            if cc_header:
-                cc_addrs = cc_header.split(',')
-                for addr in cc_addrs:
-                    _, cc_email = self._extract_email_address(addr.strip())
-                    if cc_email:
-                        cc_list.append(cc_email)
-
-            # 格式化日期
-            try:
-                date_tuple = email.utils.parsedate_tz(date_header)
-                if date_tuple:
-                    timestamp = email.utils.mktime_tz(date_tuple)
-                    date_str = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    date_str = date_header
-            except Exception:
-                date_str = date_header
-
-            # 获取邮件正文
-            body, body_type = self._get_email_body(msg)
+            headers = self._parse_headers(msg)
 
-            # 提取附件
-            attachments = self._extract_attachments(msg)
+            # 一次遍历获取邮件正文和附件
+            body, body_type, attachments = self._walk_and_classify(msg)
 
             return EmailMessage(
                 msg_id=msg_id,
-                subject=subject,
-                from_email=from_email,
-                from_name=from_name,
-                to_email=to_email,
-                date=date_str,
                 body=body,
                 body_type=body_type,
-                cc=cc_list,
                 bcc=[],
                 attachments=attachments,
-                raw_email=msg
+                raw_email=msg if keep_raw else None,
+                **headers
             )
 
         except Exception as e:
-            logger.error(f"解析邮件消息失败: {str(e)}")
+            logger.error("解析邮件消息失败: %s", e)
             raise
 
+    def _parse_email_headers(
+        self,
+        raw_email: bytes,
+        msg_id: str,
+        fetch_body: Optional[Callable[[], Optional[bytes]]] = None,
+        keep_raw: bool = False
+    ) -> EmailMessage:
+        """
+        只解析邮件头，正文和附件在首次访问时再解析
+
+        Args:
+            raw_email: 邮件原始内容（传入 fetch_body 时可以只含邮件头）
+            msg_id: 邮件 ID
+            fetch_body: 获取完整邮件内容的函数，首次访问正文时才调用；为 None 时直接解析 raw_email
+            keep_raw: 加载正文后是否保留解析后的完整 Message（raw_email）
+
+        Returns:
+            EmailMessage: 正文延迟解析的邮件对象
+        """
+        try:
+            headers = self._parse_headers(_HEADER_PARSER.parsebytes(raw_email))
+
+            def load_body() -> Dict[str, Any]:
+                full_email = fetch_body() if fetch_body is not None else raw_email
+                if full_email is None:
+                    logger.warning("获取邮件正文失败: %s", msg_id)
+                    return {'body': "", 'body_type': "plain", 'attachments': [], 'raw_email': None}
+                msg = _BYTES_PARSER.parsebytes(full_email)
+                body, body_type, attachments = self._walk_and_classify(msg)
+                return {
+                    'body': body,
+                    'body_type': body_type,
+                    'attachments': attachments,
+                    'raw_email': msg if keep_raw else None,
+                }
+
+            return EmailMessage(
+                msg_id=msg_id,
+                body="",
+                body_type="plain",
+                bcc=[],
+                lazy_loader=load_body,
+                **headers
+            )
+
+        except Exception as e:
+            logger.error("解析邮件头失败: %s", e)
+            raise
+
+    def _parse_headers(self, msg: email.message.Message) -> Dict[str, Any]:
+        """
+        解析邮件头字段
+
+        Args:
+            msg: email.message.Message 对象（可以是只含邮件头的对象）
+
+        Returns:
+            Dict: subject / from_email / from_name / to_email / date / cc
+        """
+        # 一次遍历收集所需邮件头
+        collected = _collect_headers(msg)
+
+        # 解析邮件头
+        subject = self._decode_header_value(collected.get('subject', ''))
+        date_header = collected.get('date', '')
+
+        # 地址头先按 RFC 5322 解析再解码名称，避免解码后的逗号、引号干扰拆分
+        # 提取发件人信息
+        from_name, from_email = self._extract_email_address(str(collected.get('from', '')))
+
+        # 提取收件人信息
+        _, to_email = self._extract_email_address(str(collected.get('to', '')))
+
+        # 解析抄送
+        cc_list = [addr for _, addr in email.utils.getaddresses(collected['cc']) if addr]
+
+        # 格式化日期
+        date_str = _format_date(str(date_header))
+
+        return {
+            'subject': subject,
+            'from_email': from_email,
+            'from_name': from_name,
+            'to_email': to_email,
+            'date': date_str,
+            'cc': cc_list,
+        }
+
+    def _parse_raw_email(self, item: Tuple[str, bytes], keep_raw: bool = False) -> Optional[EmailMessage]:
+        """
+        解析单封原始邮件，失败时记录日志并返回 None
+
+        Args:
+            item: (邮件 ID, 原始内容)
+            keep_raw: 是否在结果中保留解析后的完整 Message
+
+        Returns:
+            Optional[EmailMessage]: 解析后的邮件对象
+        """
+        msg_id, raw_email = item
+        try:
+            msg = _BYTES_PARSER.parsebytes(raw_email)
+            return self._parse_email_message(msg, msg_id, keep_raw)
+        except Exception as e:
+            logger.error("解析邮件 %s 失败: %s", msg_id, e)
+            return None
+
+    def _parse_raw_emails(
+        self,
+        items: List[Tuple[str, bytes]],
+        keep_raw: bool = False
+    ) -> List[Optional[EmailMessage]]:
+        """
+        批量解析原始邮件，多封时使用线程池并行解析（各邮件的解析互不依赖）
+
+        Args:
+            items: (邮件 ID, 原始内容) 列表
+            keep_raw: 是否在结果中保留解析后的完整 Message
+
+        Returns:
+            List[Optional[EmailMessage]]: 与 items 顺序一致的解析结果，失败项为 None
+        """
+        if len(items) <= 1:
+            return [self._parse_raw_email(item, keep_raw) for item in items]
+
+        with ThreadPoolExecutor(max_workers=min(self.PARSE_MAX_WORKERS, len(items))) as executor:
+            return list(executor.map(self._parse_raw_email, items, repeat(keep_raw)))
+
+    def _fetch_one(self, msg_id: str, folder: str) -> Optional[bytes]:
+        """
+        从连接池取一个连接获取单封邮件的完整内容（供延迟加载使用）
+
+        Args:
+            msg_id: 邮件 ID
+            folder: 邮件所在文件夹
+
+        Returns:
+            Optional[bytes]: 邮件原始内容，失败时为 None
+        """
+        with self._acquire_client() as client:
+            return client.fetch_email(msg_id, folder=folder)
+
+    def _parse_lazy_email(
+        self,
+        item: Tuple[str, bytes],
+        folder: str,
+        keep_raw: bool = False
+    ) -> Optional[EmailMessage]:
+        """
+        解析只含邮件头的原始内容，正文在首次访问时再从服务器获取
+
+        Args:
+            item: (邮件 ID, 邮件头原始内容)
+            folder: 邮件所在文件夹
+            keep_raw: 加载正文后是否保留解析后的完整 Message
+
+        Returns:
+            Optional[EmailMessage]: 解析后的邮件对象，失败时为 None
+        """
+        msg_id, raw_header = item
+        try:
+            return self._parse_email_headers(
+                raw_header,
+                msg_id,
+                fetch_body=lambda: self._fetch_one(msg_id, folder),
+                keep_raw=keep_raw
+            )
+        except Exception as e:
+            logger.error("解析邮件 %s 失败: %s", msg_id, e)
+            return None
+
     def receive_emails(
         self,
         count: int = 30,
         folder: str = 'INBOX',
         mark_as_read: bool = False,
-        filter_unseen: bool = False
+        filter_unseen: bool = False,
+        lazy: bool = False,
+        keep_raw: bool = False
     ) -> Dict[str, Any]:
         """
         接收邮件（重构版 - 使用 IMAPClient）
@@ -336,6 +705,10 @@ class ReceiveEmailsService:
             folder: 邮箱文件夹，默认'INBOX'
             mark_as_read: 是否标记为已读
             filter_unseen: 是否只获取未读邮件
+            lazy: 是否只获取邮件头（适合列表展示），正文和附件在首次访问时再按邮件获取；
+                  延迟获取按序号进行，期间文件夹被 EXPUNGE 可能导致序号错位
+            keep_raw: 是否在 EmailMessage.raw_email 中保留解析后的完整 Message；
+                      完整 Message 包含全部 MIME 部分（含附件），保留会显著增加内存占用
 
         Returns:
             Dict: 接收结果，包含success、emails、total、count等信息
@@ -354,56 +727,75 @@ class ReceiveEmailsService:
             # 构建搜索条件
             criteria = 'UNSEEN' if filter_unseen else 'ALL'
 
-            # 使用 IMAPClient 搜索邮件
-            logger.info(f"正在搜索邮件，条件: {criteria}, 文件夹: {folder}")
-            email_ids = self.client.search_emails(criteria=criteria, folder=folder)
-            total_count = len(email_ids)
-
-            # 限制数量
-            if count > 0:
-                email_ids = email_ids[-count:]  # 获取最新的count封邮件
-
-            logger.info(f"找到 {total_count} 封邮件，将获取最新的 {len(email_ids)} 封")
-
-            # 解析邮件
-            emails = []
-            msg_ids_to_mark = []  # 需要标记为已读的邮件ID
-
-            for msg_id in reversed(email_ids):  # 最新的邮件在前
-                try:
-                    # 使用 IMAPClient 获取邮件
-                    raw_email = self.client.fetch_email(msg_id, folder=folder)
-
-                    if raw_email:
-                        # 解析邮件
-                        msg = email.message_from_bytes(raw_email)
-                        msg_id_str = msg_id.decode() if isinstance(msg_id, bytes) else msg_id
+            # 搜索、获取和标记已读在同一连接上完成（序号只在同一会话内稳定）
+            with self._acquire_client() as client:
+                # 使用 IMAPClient 搜索邮件
+                logger.info("正在搜索邮件，条件: %s, 文件夹: %s", criteria, folder)
+                email_ids = client.search_emails(criteria=criteria, folder=folder)
+                total_count = len(email_ids)
 
-                        # 解析邮件内容
-                        email_msg = self._parse_email_message(msg, msg_id_str)
-                        emails.append(email_msg)
+                # 限制数量
+                if count > 0:
+                    email_ids = email_ids[-count:]  # 获取最新的count封邮件
 
-                        # 记录需要标记为已读的邮件
-                        if mark_as_read:
-                            msg_ids_to_mark.append(msg_id_str)
+                logger.info("找到 %d 封邮件，将获取最新的 %d 封", total_count, len(email_ids))
 
-                except Exception as e:
-                    logger.error(f"解析邮件 {msg_id} 失败: {str(e)}")
-                    continue
+                if lazy:
+                    # 列表模式只获取邮件头
+                    raw_emails = client.fetch_headers_bulk(email_ids, folder=folder)
+                else:
+                    # 一次 FETCH 获取全部邮件，避免每封邮件一次往返
+                    raw_emails = client.fetch_emails(email_ids, folder=folder)
+
+                    # 批量 FETCH 未返回的邮件（部分服务器限制序列集大小）改用流水线补取
+                    missing = [
+                        msg_id for msg_id in email_ids
+                        if (msg_id.decode() if isinstance(msg_id, bytes) else msg_id) not in raw_emails
+                    ]
+                    if missing:
+                        raw_emails.update(client.fetch_emails_pipelined(missing, folder=folder))
+
+                # 解析邮件
+                emails = []
+                msg_ids_to_mark = []  # 需要标记为已读的邮件ID
+
+                raw_items = []
+                for msg_id in reversed(email_ids):  # 最新的邮件在前
+                    msg_id_str = msg_id.decode() if isinstance(msg_id, bytes) else msg_id
+                    raw_email = raw_emails.get(msg_id_str)
+                    if not raw_email:
+                        logger.warning("获取邮件失败: %s", msg_id_str)
+                        continue
+                    raw_items.append((msg_id_str, raw_email))
 
-            # 批量标记为已读
-            if mark_as_read and msg_ids_to_mark:
-                logger.info(f"正在标记 {len(msg_ids_to_mark)} 封邮件为已读")
-                mark_result = self.client.store_flags(
-                    msg_ids=msg_ids_to_mark,
-                    flag_command='+FLAGS',
-                    flags='\\Seen',
-                    folder=folder
-                )
-                if mark_result['success']:
-                    logger.info(f"成功标记 {mark_result['count']} 封邮件为已读")
+                # 解析邮件内容（完整内容多封时并行解析）
+                if lazy:
+                    parsed = [self._parse_lazy_email(item, folder, keep_raw) for item in raw_items]
+                else:
+                    parsed = self._parse_raw_emails(raw_items, keep_raw)
 
-            logger.info(f"成功接收 {len(emails)} 封邮件")
+                for email_msg in parsed:
+                    if email_msg is None:
+                        continue
+                    emails.append(email_msg)
+
+                    # 记录需要标记为已读的邮件
+                    if mark_as_read:
+                        msg_ids_to_mark.append(email_msg.msg_id)
+
+                # 批量标记为已读
+                if mark_as_read and msg_ids_to_mark:
+                    logger.info("正在标记 %d 封邮件为已读", len(msg_ids_to_mark))
+                    mark_result = client.store_flags(
+                        msg_ids=msg_ids_to_mark,
+                        flag_command='+FLAGS',
+                        flags='\\Seen',
+                        folder=folder
+                    )
+                    if mark_result['success']:
+                        logger.info("成功标记 %d 封邮件为已读", mark_result['count'])
+
+            logger.info("成功接收 %d 封邮件", len(emails))
 
             return {
                 'success': True,
@@ -415,7 +807,7 @@ class ReceiveEmailsService:
             }
 
         except Exception as e:
-            logger.error(f"接收邮件失败: {str(e)}")
+            logger.error("接收邮件失败: %s", e)
             return {
                 'success': False,
                 'emails': [],
@@ -426,12 +818,60 @@ class ReceiveEmailsService:
                 'error_type': type(e).__name__
             }
 
-    def receive_latest_emails(self, count: int = 30) -> Dict[str, Any]:
+    def receive_many_by_uids(
+        self,
+        uids: List[Union[str, bytes]],
+        client: Optional[imaplib.IMAP4] = None,
+        folder: str = 'INBOX',
+        max_batch: int = 64
+    ) -> List[EmailMessage]:
+        """
+        按 UID 批量接收邮件（每批一次 UID FETCH，而不是每封一次往返）
+
+        Args:
+            uids: 邮件 UID 列表
+            client: 已选中文件夹的 imaplib 连接（如 IDLE 连接），为 None 时从连接池获取
+            folder: 文件夹名称（仅 client 为 None 时使用）
+            max_batch: 单次 FETCH 的最大邮件数，超出时分批获取
+
+        Returns:
+            List[EmailMessage]: 成功解析的邮件列表（顺序与 uids 一致）
+        """
+        uids = [uid.decode() if isinstance(uid, bytes) else uid for uid in uids]
+        emails = []
+
+        for start in range(0, len(uids), max_batch):
+            chunk = uids[start:start + max_batch]
+
+            if client is None:
+                with self._acquire_client() as pooled:
+                    raw_emails = pooled.fetch_emails(chunk, folder=folder, uid=True)
+            else:
+                status, msg_data = client.uid('FETCH', _compress_uid_set(chunk), '(UID FLAGS BODY.PEEK[])')
+                if status != 'OK':
+                    logger.error("批量获取邮件失败: %s", status)
+                    continue
+                raw_emails = _parse_fetch_response(msg_data, uid=True)
+
+            raw_items = []
+            for uid in chunk:
+                raw_email = raw_emails.get(uid)
+                if raw_email is None:
+                    logger.warning("获取邮件失败: %s", uid)
+                    continue
+                raw_items.append((uid, raw_email))
+
+            emails.extend(email_msg for email_msg in self._parse_raw_emails(raw_items) if email_msg is not None)
+
+        return emails
+
+    def receive_latest_emails(self, count: int = 30, lazy: bool = False) -> Dict[str, Any]:
         """
         接收最新的邮件（便捷方法）
 
         Args:
             count: 接收邮件数量，默认30封
+            lazy: 是否只获取邮件头，正文在首次访问时再获取（适合列表展示）
 
         Returns:
             Dict: 接收结果
@@ -439,7 +879,7 @@ class ReceiveEmailsService:
         示例：
             result = service.receive_latest_emails(count=10)
         """
-        return self.receive_emails(count=count, filter_unseen=False)
+        return self.receive_emails(count=count, filter_unseen=False, lazy=lazy)
 
     def receive_unread_emails(self, count: int = 30) -> Dict[str, Any]:
         """
@@ -472,9 +912,10 @@ class ReceiveEmailsService:
             print(f"未读: {status['unread_messages']}")
         """
         try:
-            return self.client.get_mailbox_status(folder)
+            with self._acquire_client() as client:
+                return client.get_mailbox_status(folder)
         except Exception as e:
-            logger.error(f"获取邮箱状态失败: {str(e)}")
+            logger.error("获取邮箱状态失败: %s", e)
             return {
                 'success': False,
                 'message': f'获取邮箱状态失败: {str(e)}'
@@ -492,9 +933,10 @@ class ReceiveEmailsService:
             print(f"可用文件夹: {folders['folders']}")
         """
         try:
-            return self.client.list_folders()
+            with self._acquire_client() as client:
+                return client.list_folders()
         except Exception as e:
-            logger.error(f"列出文件夹失败: {str(e)}")
+            logger.error("列出文件夹失败: %s", e)
             return {
                 'success': False,
                 'folders': [],
@@ -502,8 +944,11 @@ class ReceiveEmailsService:
             }
 
     def close(self):
-        """关闭服务连接"""
-        self.client.close()
+        """关闭服务连接（包括连接池中的全部连接）"""
+        with self._clients_lock:
+            clients = list(self._all_clients)
+        for client in clients:
+            client.close()
 
     def __enter__(self):
         """上下文管理器入口"""
@@ -514,14 +959,34 @@ class ReceiveEmailsService:
         self.close()
 
 
-# 创建全局实例
-receive_emails_service = ReceiveEmailsService()
+# 全局服务实例（首次使用时创建，导入本模块不读取配置、不建立连接）
+_global_service: Optional[ReceiveEmailsService] = None
+
+
+def get_receive_emails_service() -> ReceiveEmailsService:
+    """
+    获取邮件接收服务实例（单例模式）
+
+    Returns:
+        ReceiveEmailsService: 邮件接收服务实例
+    """
+    global _global_service
+
+    if _global_service is None:
+        _global_service = ReceiveEmailsService()
+
+    return _global_service
 
 
 if __name__ == "__main__":
     """测试代码"""
     import json
 
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
     print("=== 测试邮件接收服务（重构版）===\n")
 
     # 测试：使用上下文管理器
@@ -3,12 +3,20 @@
 支持多种类型的定时任务，在独立线程中执行邮件发送等任务
 """
 
+import functools
+import heapq
+import inspect
+import itertools
 import logging
+import os
 import threading
+import weakref
 from datetime import datetime, time
-from typing import Callable, Dict, Any, Optional, List, Union
+from time import time_ns
+from typing import Callable, Dict, Any, Iterator, Optional, List, Tuple, Union
 from enum import Enum
 from pathlib import Path
+from zoneinfo import ZoneInfo
 
 try:
     from apscheduler.schedulers.background import BackgroundScheduler
@@ -17,6 +25,7 @@ try:
     from apscheduler.triggers.interval import IntervalTrigger
     from apscheduler.jobstores.memory import MemoryJobStore
     from apscheduler.executors.pool import ThreadPoolExecutor
+    from apscheduler.schedulers.base import STATE_RUNNING
     APSCHEDULER_AVAILABLE = True
 except ImportError:
     APSCHEDULER_AVAILABLE = False
@@ -28,6 +37,40 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 调度使用的时区（模块加载时解析一次，所有触发器共用）
+_TZ = ZoneInfo('Asia/Shanghai')
+
+_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _parse_datetime(value: str) -> datetime:
+    """
+    解析 "YYYY-MM-DD HH:MM:SS" 格式的时间字符串
+
+    固定格式直接按位置切片转换，避免 strptime 的格式解析开销；
+    格式不符时回退到 strptime（同时保留其错误信息）。
+
+    Args:
+        value: 时间字符串
+
+    Returns:
+        datetime: 解析后的时间
+    """
+    if (
+        len(value) == 19
+        and value[4] == '-' and value[7] == '-' and value[10] == ' '
+        and value[13] == ':' and value[16] == ':'
+        and value.replace('-', '').replace(' ', '').replace(':', '').isdigit()
+    ):
+        try:
+            return datetime(
+                int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                int(value[11:13]), int(value[14:16]), int(value[17:19])
+            )
+        except ValueError:
+            pass
+    return datetime.strptime(value, _DATETIME_FORMAT)
+
 
 class ScheduleType(Enum):
     """定时器类型枚举"""
@@ -38,9 +81,55 @@ class ScheduleType(Enum):
     CRON = "cron"              # Cron表达式
 
 
+def _as_list(emails: Union[str, List[str], None]) -> List[str]:
+    """将单个邮箱、邮箱列表或空值统一为列表"""
+    if not emails:
+        return []
+    if isinstance(emails, str):
+        return [emails]
+    return list(emails)
+
+
+@functools.lru_cache(maxsize=512)
+def _cron_trigger(minute: str, hour: str, day: str, month: str, day_of_week: str) -> 'CronTrigger':
+    """
+    按字段构建 CronTrigger 并缓存
+
+    CronTrigger 构建时会逐字段做正则解析，而触发器本身无状态，
+    相同表达式的任务（如大量 "0 * * * *"）可以共用同一个实例。
+    """
+    return CronTrigger(
+        minute=minute,
+        hour=hour,
+        day=day,
+        month=month,
+        day_of_week=day_of_week,
+        timezone=_TZ
+    )
+
+
+def _callback_ref(callback: Optional[Callable]) -> Optional[Callable]:
+    """
+    生成任务参数中保存的回调引用
+
+    绑定方法改为弱引用，避免任务存续期间一直持有其所属对象；
+    普通函数/lambda 通常只被任务本身引用，弱引用会让其立即失效，因此仍保存强引用。
+    """
+    if inspect.ismethod(callback):
+        return weakref.WeakMethod(callback)
+    return callback
+
+
 class EmailTask:
     """邮件任务类"""
 
+    # 任务对象可能成千上万，使用 __slots__ 省去每个实例的 __dict__
+    __slots__ = (
+        'task_id', 'recipients', 'subject', 'content', 'content_type',
+        'cc_emails', 'bcc_emails', 'attachment_paths', 'sender_name', 'frozen_kwargs',
+        '_dict_cache',
+    )
+
     def __init__(
         self,
         task_id: str,
@@ -63,19 +152,39 @@ class EmailTask:
         self.attachment_paths = attachment_paths
         self.sender_name = sender_name
 
-    def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
-        return {
-            'task_id': self.task_id,
-            'recipients': self.recipients,
-            'subject': self.subject,
-            'content': self.content,
-            'content_type': self.content_type,
-            'cc_emails': self.cc_emails,
-            'bcc_emails': self.bcc_emails,
-            'attachment_paths': self.attachment_paths,
-            'sender_name': self.sender_name
+        # send_email 的参数在创建时标准化并构建一次，每次触发直接使用
+        self.frozen_kwargs: Dict[str, Any] = {
+            'to_emails': _as_list(recipients),
+            'subject': subject,
+            'content': content,
+            'content_type': content_type,
+            'cc_emails': _as_list(cc_emails),
+            'bcc_emails': _as_list(bcc_emails),
+            'attachment_paths': list(attachment_paths or []),
+            'sender_name': sender_name,
         }
+        self._dict_cache: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为字典
+
+        任务字段在创建后视为不可变（frozen_kwargs 同样依赖这一点），
+        字典在首次调用时构建并缓存，之后返回同一个对象，调用方不应修改。
+        """
+        if self._dict_cache is None:
+            self._dict_cache = {
+                'task_id': self.task_id,
+                'recipients': self.recipients,
+                'subject': self.subject,
+                'content': self.content,
+                'content_type': self.content_type,
+                'cc_emails': self.cc_emails,
+                'bcc_emails': self.bcc_emails,
+                'attachment_paths': self.attachment_paths,
+                'sender_name': self.sender_name
+            }
+        return self._dict_cache
 
 
 class SchedulerService:
@@ -90,36 +199,35 @@ class SchedulerService:
     - Cron任务：使用Cron表达式
     """
 
-    _instance = None
-    _lock = threading.Lock()
+    # 任务信息分片数（2 的幂），不同分片的注册/移除互不阻塞
+    TASK_SHARDS = 16
 
-    def __new__(cls, *args, **kwargs):
-        """单例模式"""
-        if cls._instance is None:
-            with cls._lock:
-                if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-        return cls._instance
-
-    def __init__(self, max_workers: int = 10):
+    def __init__(self, max_workers: Optional[int] = None):
         """
         初始化定时器服务
 
         Args:
-            max_workers: 最大工作线程数
+            max_workers: 任务执行线程池的最大线程数，每个线程同时执行一个触发的任务；
+                         默认 min(32, CPU 核数 + 4)
         """
-        if hasattr(self, '_initialized') and self._initialized:
-            return
-
         if not APSCHEDULER_AVAILABLE:
             raise ImportError(
                 "需要安装 APScheduler 库。请运行: pip install apscheduler"
             )
 
-        self.max_workers = max_workers
+        self.max_workers = max_workers if max_workers is not None else min(32, (os.cpu_count() or 1) + 4)
         self.scheduler = None
         self.email_service = None
-        self.tasks: Dict[str, Dict[str, Any]] = {}
+        # 任务信息按 job_id 哈希分片，每个分片一把锁
+        self._task_shards: List[Dict[str, Dict[str, Any]]] = [{} for _ in range(self.TASK_SHARDS)]
+        self._shard_locks: List[threading.Lock] = [threading.Lock() for _ in range(self.TASK_SHARDS)]
+        # 即将执行任务的小顶堆 (下次执行时间戳, job_id)；条目过期后在查询时惰性修正。
+        # _upcoming_ts 记录每个任务当前有效的时间戳，与之不符的堆条目视为过期直接丢弃
+        self._upcoming: List[Tuple[float, str]] = []
+        self._upcoming_ts: Dict[str, float] = {}
+        self._upcoming_lock = threading.Lock()
+        # 自动任务ID计数器；count.__next__ 在 C 层一步完成，多线程取号无需加锁
+        self._next_id = itertools.count(1).__next__
         self._initialized = False
         self._running = False
 
@@ -127,6 +235,33 @@ class SchedulerService:
         from .send_email_service import QQEmailService
         self.email_service = QQEmailService()
 
+    def next_task_id(self, prefix: str = "task") -> str:
+        """
+        生成一个本实例内唯一的任务ID
+
+        调用方无需自行拼接ID时使用，得到的短字符串（如 "task-42"）可直接传给各 schedule_* 方法。
+
+        Args:
+            prefix: ID前缀
+
+        Returns:
+            str: 任务ID
+        """
+        return f"{prefix}-{self._next_id()}"
+
+    def _shard_index(self, job_id: str) -> int:
+        """任务所在分片的下标"""
+        return hash(job_id) & (self.TASK_SHARDS - 1)
+
+    @property
+    def tasks(self) -> Dict[str, Dict[str, Any]]:
+        """全部任务信息的快照（job_id -> 任务信息）"""
+        snapshot = {}
+        for shard, lock in zip(self._task_shards, self._shard_locks):
+            with lock:
+                snapshot.update(shard)
+        return snapshot
+
     def initialize(self) -> None:
         """初始化调度器"""
         if self._initialized:
@@ -150,14 +285,14 @@ class SchedulerService:
                 jobstores=jobstores,
                 executors=executors,
                 job_defaults=job_defaults,
-                timezone='Asia/Shanghai'
+                timezone=_TZ
             )
 
             logger.info("定时器服务初始化成功")
             self._initialized = True
 
         except Exception as e:
-            logger.error(f"定时器服务初始化失败: {str(e)}")
+            logger.error("定时器服务初始化失败: %s", e)
             raise
 
     def start(self) -> None:
@@ -168,6 +303,9 @@ class SchedulerService:
         if not self._running:
             self.scheduler.start()
             self._running = True
+            # 启动前添加的任务此时才计算出下次执行时间，补充加入即将执行堆
+            for job in self.scheduler.get_jobs():
+                self._push_upcoming(job)
             logger.info("定时器服务已启动")
 
     def stop(self) -> None:
@@ -182,21 +320,22 @@ class SchedulerService:
         try:
             if self.scheduler:
                 self.scheduler.pause_job(job_id)
-                logger.info(f"任务已暂停: {job_id}")
+                logger.info("任务已暂停: %s", job_id)
                 return True
         except Exception as e:
-            logger.error(f"暂停任务失败: {str(e)}")
+            logger.error("暂停任务失败: %s", e)
         return False
 
     def resume_job(self, job_id: str) -> bool:
         """恢复指定任务"""
         try:
             if self.scheduler:
-                self.scheduler.resume_job(job_id)
-                logger.info(f"任务已恢复: {job_id}")
+                job = self.scheduler.resume_job(job_id)
+                self._push_upcoming(job)
+                logger.info("任务已恢复: %s", job_id)
                 return True
         except Exception as e:
-            logger.error(f"恢复任务失败: {str(e)}")
+            logger.error("恢复任务失败: %s", e)
         return False
 
     def remove_job(self, job_id: str) -> bool:
@@ -204,30 +343,99 @@ class SchedulerService:
         try:
             if self.scheduler:
                 self.scheduler.remove_job(job_id)
-                if job_id in self.tasks:
-                    del self.tasks[job_id]
-                logger.info(f"任务已移除: {job_id}")
+                index = self._shard_index(job_id)
+                with self._shard_locks[index]:
+                    self._task_shards[index].pop(job_id, None)
+                with self._upcoming_lock:
+                    self._upcoming_ts.pop(job_id, None)
+                    self._compact_upcoming()
+                logger.info("任务已移除: %s", job_id)
                 return True
         except Exception as e:
-            logger.error(f"移除任务失败: {str(e)}")
+            logger.error("移除任务失败: %s", e)
         return False
 
-    def list_jobs(self) -> List[Dict[str, Any]]:
-        """列出所有任务"""
-        jobs = []
+    def iter_jobs(self) -> Iterator[Dict[str, Any]]:
+        """
+        逐个生成任务信息，只需要前几个任务时不必构建完整列表
+
+        next_run_time 为带时区的 datetime（暂停的任务为 None），
+        需要字符串时由调用方自行格式化。
+        """
         if self.scheduler:
             for job in self.scheduler.get_jobs():
-                jobs.append({
+                yield {
                     'id': job.id,
                     'name': job.name,
-                    'next_run_time': job.next_run_time.isoformat() if job.next_run_time else None,
+                    'next_run_time': job.next_run_time,
+                    'trigger': str(job.trigger)
+                }
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """列出所有任务"""
+        return list(self.iter_jobs())
+
+    def top_upcoming(self, n: int = 10) -> List[Dict[str, Any]]:
+        """
+        列出最近将要执行的 n 个任务（按下次执行时间排序）
+
+        只查看堆顶附近的条目，不枚举全部任务；已移除、暂停或已改期的条目在此时修正。
+
+        Args:
+            n: 返回的任务数量
+
+        Returns:
+            List[Dict]: 与 list_jobs 相同格式的任务列表
+        """
+        if not self.scheduler or n <= 0:
+            return []
+
+        result = []
+        valid = []
+        seen = set()
+        with self._upcoming_lock:
+            heap = self._upcoming
+            live = self._upcoming_ts
+            while heap and len(valid) < n:
+                entry = heapq.heappop(heap)
+                timestamp, job_id = entry
+                if live.get(job_id) != timestamp or job_id in seen:
+                    # 已被更新时间的条目取代，或同一任务重复入堆
+                    continue
+                job = self.scheduler.get_job(job_id)
+                next_run_time = getattr(job, 'next_run_time', None)
+                if next_run_time is None:
+                    # 已执行完毕、已移除或已暂停（恢复时会重新入堆）
+                    del live[job_id]
+                    continue
+                current = next_run_time.timestamp()
+                if current != timestamp:
+                    # 任务已改期：按新时间重新入堆
+                    live[job_id] = current
+                    heapq.heappush(heap, (current, job_id))
+                    continue
+                seen.add(job_id)
+                valid.append(entry)
+                result.append({
+                    'id': job.id,
+                    'name': job.name,
+                    'next_run_time': job.next_run_time,
                     'trigger': str(job.trigger)
                 })
-        return jobs
+            for entry in valid:
+                heapq.heappush(heap, entry)
+        return result
 
     def get_task_info(self, job_id: str) -> Optional[Dict[str, Any]]:
         """获取任务信息"""
-        return self.tasks.get(job_id)
+        index = self._shard_index(job_id)
+        with self._shard_locks[index]:
+            info = self._task_shards[index].get(job_id)
+        if info is None:
+            return None
+        info = dict(info)
+        info['created_at'] = datetime.fromtimestamp(info.pop('created_ns') / 1e9)
+        return info
 
     # ==================== 一次性任务 ====================
 
@@ -267,22 +475,23 @@ class SchedulerService:
         """
         try:
             if isinstance(run_date, str):
-                run_date = datetime.strptime(run_date, "%Y-%m-%d %H:%M:%S")
+                run_date = _parse_datetime(run_date)
 
             job = self.scheduler.add_job(
                 func=self._execute_task,
-                trigger=DateTrigger(run_date=run_date, timezone='Asia/Shanghai'),
+                trigger=DateTrigger(run_date=run_date, timezone=_TZ),
                 id=task_id,
-                args=[task, callback],
-                name=f"一次性任务-{task_id}"
+                args=[self._make_runner(task), _callback_ref(callback)],
+                name=f"一次性任务-{task_id}",
+                replace_existing=True
             )
 
             self._register_task(task_id, ScheduleType.ONCE, job, task)
-            logger.info(f"一次性任务已添加: {task_id}, 执行时间: {run_date}")
+            logger.info("一次性任务已添加: %s, 执行时间: %s", task_id, run_date)
             return True
 
         except Exception as e:
-            logger.error(f"添加一次性任务失败: {str(e)}")
+            logger.error("添加一次性任务失败: %s", e)
             return False
 
     # ==================== 每天定时任务 ====================
@@ -316,26 +525,28 @@ class SchedulerService:
         try:
             if isinstance(run_time, str):
                 hour, minute = map(int, run_time.split(':'))
-                run_time = time(hour=hour, minute=minute)
+            else:
+                hour, minute = run_time.hour, run_time.minute
 
             job = self.scheduler.add_job(
                 func=self._execute_task,
                 trigger=CronTrigger(
-                    hour=run_time.hour,
-                    minute=run_time.minute,
-                    timezone='Asia/Shanghai'
+                    hour=hour,
+                    minute=minute,
+                    timezone=_TZ
                 ),
                 id=task_id,
-                args=[task, callback],
-                name=f"每天定时任务-{task_id}"
+                args=[self._make_runner(task), _callback_ref(callback)],
+                name=f"每天定时任务-{task_id}",
+                replace_existing=True
             )
 
             self._register_task(task_id, ScheduleType.DAILY, job, task)
-            logger.info(f"每天定时任务已添加: {task_id}, 执行时间: {run_time}")
+            logger.info("每天定时任务已添加: %s, 执行时间: %s", task_id, run_time)
             return True
 
         except Exception as e:
-            logger.error(f"添加每天定时任务失败: {str(e)}")
+            logger.error("添加每天定时任务失败: %s", e)
             return False
 
     # ==================== 每周定时任务 ====================
@@ -371,27 +582,29 @@ class SchedulerService:
         try:
             if isinstance(run_time, str):
                 hour, minute = map(int, run_time.split(':'))
-                run_time = time(hour=hour, minute=minute)
+            else:
+                hour, minute = run_time.hour, run_time.minute
 
             job = self.scheduler.add_job(
                 func=self._execute_task,
                 trigger=CronTrigger(
                     day_of_week=day_of_week,
-                    hour=run_time.hour,
-                    minute=run_time.minute,
-                    timezone='Asia/Shanghai'
+                    hour=hour,
+                    minute=minute,
+                    timezone=_TZ
                 ),
                 id=task_id,
-                args=[task, callback],
-                name=f"每周定时任务-{task_id}"
+                args=[self._make_runner(task), _callback_ref(callback)],
+                name=f"每周定时任务-{task_id}",
+                replace_existing=True
             )
 
             self._register_task(task_id, ScheduleType.WEEKLY, job, task)
-            logger.info(f"每周定时任务已添加: {task_id}, 星期{day_of_week}, 时间: {run_time}")
+            logger.info("每周定时任务已添加: %s, 星期%s, 时间: %s", task_id, day_of_week, run_time)
             return True
 
         except Exception as e:
-            logger.error(f"添加每周定时任务失败: {str(e)}")
+            logger.error("添加每周定时任务失败: %s", e)
             return False
 
     # ==================== 间隔任务 ====================
@@ -428,26 +641,27 @@ class SchedulerService:
             trigger_kwargs = {'seconds': interval_seconds}
             if start_date:
                 if isinstance(start_date, str):
-                    start_date = datetime.strptime(start_date, "%Y-%m-%d %H:%M:%S")
+                    start_date = _parse_datetime(start_date)
                 trigger_kwargs['start_date'] = start_date
 
             job = self.scheduler.add_job(
                 func=self._execute_task,
                 trigger=IntervalTrigger(
                     **trigger_kwargs,
-                    timezone='Asia/Shanghai'
+                    timezone=_TZ
                 ),
                 id=task_id,
-                args=[task, callback],
-                name=f"间隔任务-{task_id}"
+                args=[self._make_runner(task), _callback_ref(callback)],
+                name=f"间隔任务-{task_id}",
+                replace_existing=True
             )
 
             self._register_task(task_id, ScheduleType.INTERVAL, job, task)
-            logger.info(f"间隔任务已添加: {task_id}, 间隔: {interval_seconds}秒")
+            logger.info("间隔任务已添加: %s, 间隔: %s秒", task_id, interval_seconds)
             return True
 
         except Exception as e:
-            logger.error(f"添加间隔任务失败: {str(e)}")
+            logger.error("添加间隔任务失败: %s", e)
             return False
 
     # ==================== Cron表达式任务 ====================
@@ -486,31 +700,80 @@ class SchedulerService:
             if len(parts) != 5:
                 raise ValueError("Cron表达式格式错误，应为: 分 时 日 月 周")
 
-            minute, hour, day, month, day_of_week = parts
-
             job = self.scheduler.add_job(
                 func=self._execute_task,
-                trigger=CronTrigger(
-                    minute=minute,
-                    hour=hour,
-                    day=day,
-                    month=month,
-                    day_of_week=day_of_week,
-                    timezone='Asia/Shanghai'
-                ),
+                trigger=_cron_trigger(*parts),
                 id=task_id,
-                args=[task, callback],
-                name=f"Cron任务-{task_id}"
+                args=[self._make_runner(task), _callback_ref(callback)],
+                name=f"Cron任务-{task_id}",
+                replace_existing=True
             )
 
             self._register_task(task_id, ScheduleType.CRON, job, task)
-            logger.info(f"Cron任务已添加: {task_id}, 表达式: {cron_expression}")
+            logger.info("Cron任务已添加: %s, 表达式: %s", task_id, cron_expression)
             return True
 
         except Exception as e:
-            logger.error(f"添加Cron任务失败: {str(e)}")
+            logger.error("添加Cron任务失败: %s", e)
             return False
 
+    # ==================== 批量添加 ====================
+
+    def schedule_batch(
+        self,
+        specs: List[Tuple[Union[ScheduleType, str], Dict[str, Any]]]
+    ) -> Dict[str, bool]:
+        """
+        批量安排任务
+
+        添加期间暂停调度并持有任务存储锁：每次添加不再单独唤醒调度线程，
+        调度线程也不会在两次添加之间抢锁；全部添加完成后恢复并唤醒一次。
+
+        Args:
+            specs: 任务列表，每项为 (定时器类型, 对应 schedule_* 方法的关键字参数)
+
+        Returns:
+            Dict[str, bool]: 任务ID -> 是否添加成功
+
+        Example:
+            schedule_batch([
+                (ScheduleType.ONCE, {'task_id': 't1', 'run_date': '2025-12-30 12:00:00', 'task': email_task}),
+                (ScheduleType.DAILY, {'task_id': 't2', 'run_time': '09:00', 'task': email_task}),
+            ])
+        """
+        if not self._initialized:
+            self.initialize()
+
+        schedulers = {
+            ScheduleType.ONCE: self.schedule_once,
+            ScheduleType.DAILY: self.schedule_daily,
+            ScheduleType.WEEKLY: self.schedule_weekly,
+            ScheduleType.INTERVAL: self.schedule_interval,
+            ScheduleType.CRON: self.schedule_cron,
+        }
+
+        results = {}
+        paused = self.scheduler.state == STATE_RUNNING
+        if paused:
+            self.scheduler.pause()
+        try:
+            with self.scheduler._jobstores_lock:
+                for schedule_type, kwargs in specs:
+                    task_id = kwargs.get('task_id')
+                    try:
+                        schedule = schedulers[ScheduleType(schedule_type)]
+                    except (KeyError, ValueError):
+                        logger.error("未知的定时器类型: %s", schedule_type)
+                        results[task_id] = False
+                        continue
+                    results[task_id] = schedule(**kwargs)
+        finally:
+            if paused:
+                self.scheduler.resume()
+
+        logger.info("批量添加任务完成: %d/%d 成功", sum(results.values()), len(specs))
+        return results
+
     # ==================== 辅助方法 ====================
 
     def _register_task(
@@ -521,67 +784,115 @@ class SchedulerService:
         task: Union[EmailTask, Callable]
     ) -> None:
         """注册任务信息"""
-        self.tasks[job_id] = {
+        info = {
             'job_id': job_id,
             'schedule_type': schedule_type,
             'job': job,
             'task': task,
-            'created_at': datetime.now()
+            # 整数纳秒时间戳，读取任务信息时才转换为 datetime
+            'created_ns': time_ns()
         }
+        index = self._shard_index(job_id)
+        with self._shard_locks[index]:
+            self._task_shards[index][job_id] = info
+        self._push_upcoming(job)
+
+    def _push_upcoming(self, job) -> None:
+        """将任务按下次执行时间加入即将执行堆（调度器启动前添加的任务尚无下次执行时间，启动时再加入）"""
+        next_run_time = getattr(job, 'next_run_time', None)
+        if next_run_time is None:
+            return
+        timestamp = next_run_time.timestamp()
+        with self._upcoming_lock:
+            if self._upcoming_ts.get(job.id) == timestamp:
+                # 同一任务以相同时间重复注册（如 replace_existing 或先移除再添加）
+                return
+            self._upcoming_ts[job.id] = timestamp
+            heapq.heappush(self._upcoming, (timestamp, job.id))
+            self._compact_upcoming()
+
+    def _compact_upcoming(self) -> None:
+        """过期条目过多时按有效时间戳重建堆（调用方需持有 _upcoming_lock）"""
+        if len(self._upcoming) > 2 * len(self._upcoming_ts) + 64:
+            self._upcoming = [(ts, job_id) for job_id, ts in self._upcoming_ts.items()]
+            heapq.heapify(self._upcoming)
+
+    def _make_runner(self, task: Union[EmailTask, Callable]) -> Callable[[], Dict[str, Any]]:
+        """
+        在安排任务时确定执行方式，生成每次触发时直接调用的执行函数
+
+        邮件任务直接使用创建时构建好的 frozen_kwargs，触发时不再做类型判断和参数组装；
+        日志方法也在此绑定为闭包变量，省去每次触发时的全局/属性查找。
+
+        Args:
+            task: 邮件任务对象或可执行函数
+
+        Returns:
+            Callable: 无参执行函数，返回执行结果字典
+        """
+        log_info = logger.info
+        log_error = logger.error
+
+        if isinstance(task, EmailTask):
+            task_id = task.task_id
+            send_email = self.email_service.send_email
+            send_kwargs = task.frozen_kwargs
+
+            def run_email_task() -> Dict[str, Any]:
+                # 执行邮件任务
+                log_info("开始执行邮件任务: %s", task_id)
+                result = send_email(**send_kwargs)
+
+                if result['success']:
+                    log_info("邮件任务执行成功: %s", task_id)
+                else:
+                    log_error("邮件任务执行失败: %s, 错误: %s", task_id, result.get('message'))
+                return result
+
+            return run_email_task
+
+        if callable(task):
+            def run_callable() -> Dict[str, Any]:
+                # 执行自定义函数
+                log_info("开始执行自定义任务")
+                data = task()
+                log_info("自定义任务执行完成")
+                return {'success': True, 'message': '任务执行完成', 'data': data}
+
+            return run_callable
+
+        raise TypeError(f"不支持的任务类型: {type(task).__name__}")
 
     def _execute_task(
         self,
-        task: Union[EmailTask, Callable],
+        runner: Callable[[], Dict[str, Any]],
         callback: Optional[Callable] = None
     ) -> Dict[str, Any]:
         """
         执行任务
 
         Args:
-            task: 邮件任务对象或可执行函数
-            callback: 回调函数
+            runner: _make_runner 生成的执行函数
+            callback: 回调函数；绑定方法以 WeakMethod 保存，所属对象被回收后跳过回调
 
         Returns:
             Dict: 执行结果
         """
-        result = {'success': False, 'message': '', 'data': None}
-
         try:
-            if isinstance(task, EmailTask):
-                # 执行邮件任务
-                logger.info(f"开始执行邮件任务: {task.task_id}")
-                result = self.email_service.send_email(
-                    to_emails=task.recipients,
-                    subject=task.subject,
-                    content=task.content,
-                    content_type=task.content_type,
-                    cc_emails=task.cc_emails,
-                    bcc_emails=task.bcc_emails,
-                    attachment_paths=task.attachment_paths,
-                    sender_name=task.sender_name
-                )
+            result = runner()
 
-                if result['success']:
-                    logger.info(f"邮件任务执行成功: {task.task_id}")
-                else:
-                    logger.error(f"邮件任务执行失败: {task.task_id}, 错误: {result.get('message')}")
-
-            elif callable(task):
-                # 执行自定义函数
-                logger.info("开始执行自定义任务")
-                result = task()
-                result = {'success': True, 'message': '任务执行完成', 'data': result}
-                logger.info("自定义任务执行完成")
+            if type(callback) is weakref.WeakMethod:
+                callback = callback()
 
             # 执行回调
             if callback:
                 try:
                     callback(result)
                 except Exception as e:
-                    logger.error(f"回调函数执行失败: {str(e)}")
+                    logger.error("回调函数执行失败: %s", e)
 
         except Exception as e:
-            logger.error(f"任务执行异常: {str(e)}")
+            logger.error("任务执行异常: %s", e)
             result = {
                 'success': False,
                 'message': f'任务执行异常: {str(e)}',
@@ -602,11 +913,11 @@ class SchedulerService:
                 if job:
                     return job.next_run_time
         except Exception as e:
-            logger.error(f"获取任务下次执行时间失败: {str(e)}")
+            logger.error("获取任务下次执行时间失败: %s", e)
         return None
 
 
-# 创建全局实例
+# 全局实例（应用内共用这一个调度器，直接导入 scheduler_service 使用）
 scheduler_service = SchedulerService()
 
 
@@ -616,8 +927,8 @@ if __name__ == "__main__":
     # 测试定时器服务
     print("=== 测试定时器服务 ===\n")
 
-    # 创建调度器实例
-    service = SchedulerService()
+    # 使用全局调度器实例
+    service = scheduler_service
 
     # 启动服务
     service.start()
@@ -661,15 +972,18 @@ if __name__ == "__main__":
     print("\n当前任务列表:")
     jobs = service.list_jobs()
     for job in jobs:
-        print(f"  - {job['name']}: 下次执行时间 {job['next_run_time']}")
+        next_run_time = job['next_run_time']
+        print(f"  - {job['name']}: 下次执行时间 {next_run_time.isoformat() if next_run_time else None}")
 
     # 保持运行以便观察定时执行
+    # 主线程阻塞在事件上，收到 Ctrl+C 时由信号处理函数唤醒，空闲时不再周期性醒来
+    import signal
+    stop_event = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+
     print("\n调度器正在运行，按 Ctrl+C 退出...")
-    try:
-        import time
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("\n\n正在停止调度器...")
-        service.stop()
-        print("调度器已停止")
+    stop_event.wait()
+
+    print("\n\n正在停止调度器...")
+    service.stop()
+    print("调度器已停止")
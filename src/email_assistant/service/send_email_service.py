@@ -3,19 +3,40 @@ QQ邮件发送服务
 支持发送文本邮件、HTML邮件、附件，以及完善的错误处理
 """
 
+import atexit
+import binascii
+import functools
+import mimetypes
+import mmap
+import os
+import queue
+import re
 import smtplib
 import logging
+import threading
+import time
+from contextlib import contextmanager
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
-from email import encoders
 from email.utils import formataddr
 from pathlib import Path
-from typing import List, Optional, Union, Dict, Any
-import chardet
+from typing import Iterator, List, Optional, Tuple, Union, Dict, Any
 from email_validator import validate_email, EmailNotValidError
 from ..config import EmailConfig
 
+try:
+    # cchardet（uchardet 的 C 实现）与 chardet 接口相同，速度快一个数量级
+    from cchardet import detect as _detect_charset
+except ImportError:
+    from chardet import detect as _detect_charset
+
+try:
+    # pybase64 使用 SIMD 指令编码，大附件上比 binascii 逐行编码快数倍
+    from pybase64 import encodebytes as _simd_encodebytes
+except ImportError:
+    _simd_encodebytes = None
+
 
 # 配置日志
 logging.basicConfig(
@@ -25,6 +46,236 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# 编码检测只读取文件开头的这么多字节，检测准确率早在此之前就已稳定
+_ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# base64 每行编码的原始字节数，对应 MIME 要求的 76 字符行宽
+_BASE64_LINE_BYTES = 57
+
+
+def _encode_file_base64(file_path: str) -> str:
+    """
+    将文件内容按 MIME 格式（每行 76 字符）进行 base64 编码
+
+    通过 mmap 直接读取文件映射：安装了 pybase64 时整体交给其 SIMD 实现编码；
+    否则逐行编码写入预先分配好的缓冲区，避免先把整个文件读入 bytes 再复制编码。
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        str: base64 编码后的内容
+    """
+    # 内容经 mmap 读取，不需要 Python 层的读缓冲
+    with open(file_path, 'rb', buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return ''
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if _simd_encodebytes is not None:
+                return _simd_encodebytes(mapped).decode('ascii')
+
+            lines = (size + _BASE64_LINE_BYTES - 1) // _BASE64_LINE_BYTES
+            buf = bytearray(((size + 2) // 3) * 4 + lines)
+            src = memoryview(mapped)
+            out = memoryview(buf)
+            try:
+                pos = 0
+                for start in range(0, size, _BASE64_LINE_BYTES):
+                    line = binascii.b2a_base64(src[start:start + _BASE64_LINE_BYTES])
+                    out[pos:pos + len(line)] = line
+                    pos += len(line)
+            finally:
+                out.release()
+                src.release()
+
+    return buf.decode('ascii')
+
+
+@functools.lru_cache(maxsize=8192)
+def _validate_email_cached(email: str) -> bool:
+    """
+    验证邮箱地址格式并缓存结果
+
+    批量发送时同一收件人反复出现，重复地址直接命中缓存，不再做正则和 IDNA 规范化。
+    """
+    try:
+        # 只验证格式，不检查DNS可投递性
+        validate_email(email, check_deliverability=False)
+        return True
+    except EmailNotValidError:
+        return False
+
+
+# 附件扩展名（小写）到 Content-Type 的映射：以系统 MIME 数据库为基础（覆盖 .mp4、.svg、.webp 等），
+# 导入时合并一次；下面手工维护的常用类型优先，保证在不同系统上结果一致
+mimetypes.init()
+_CONTENT_TYPES = {
+    **mimetypes.types_map,
+    '.txt': 'text/plain',
+    '.pdf': 'application/pdf',
+    '.doc': 'application/msword',
+    '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    '.xls': 'application/vnd.ms-excel',
+    '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.zip': 'application/zip',
+    '.rar': 'application/x-rar-compressed',
+    '.json': 'application/json',
+    '.xml': 'application/xml',
+    '.csv': 'text/csv',
+}
+
+# 预先拆分为 (maintype, subtype)，创建附件时无需再对 Content-Type 做 split
+_CONTENT_TYPE_PARTS: Dict[str, Tuple[str, str]] = {
+    extension: tuple(content_type.split('/', 1)) for extension, content_type in _CONTENT_TYPES.items()
+}
+_DEFAULT_CONTENT_TYPE_PARTS = ('application', 'octet-stream')
+
+# 邮件正文中以 "." 开头的行需要转义为 ".."（RFC 5321 4.5.2）
+_LEADING_DOT = re.compile(br'(?m)^\.')
+
+
+class _PipeliningSMTP(smtplib.SMTP):
+    """
+    支持 PIPELINING（RFC 2920）的 SMTP 连接
+
+    服务器声明支持该扩展时，MAIL FROM、全部 RCPT TO 和 DATA 一次写出，再依次读取响应，
+    每封邮件的命令往返从 (2 + 收件人数) 次减少到 1 次；否则退回标准实现。
+    """
+
+    def sendmail(self, from_addr, to_addrs, msg, mail_options=(), rcpt_options=()):
+        self.ehlo_or_helo_if_needed()
+        # send_message 总是传入 bytes；字符串消息的换行规范化等细节交给标准实现
+        if not isinstance(msg, bytes) or not (self.does_esmtp and self.has_extn('pipelining')):
+            return super().sendmail(from_addr, to_addrs, msg, mail_options, rcpt_options)
+
+        if isinstance(to_addrs, str):
+            to_addrs = [to_addrs]
+
+        esmtp_opts = []
+        if self.has_extn('size'):
+            esmtp_opts.append("size=%d" % len(msg))
+        esmtp_opts.extend(mail_options)
+        if any(option.lower() == 'smtputf8' for option in esmtp_opts):
+            if not self.has_extn('smtputf8'):
+                raise smtplib.SMTPNotSupportedError('SMTPUTF8 not supported by server')
+            self.command_encoding = 'utf-8'
+
+        mail_suffix = ' ' + ' '.join(esmtp_opts) if esmtp_opts else ''
+        rcpt_suffix = ' ' + ' '.join(rcpt_options) if rcpt_options else ''
+        commands = ["mail from:%s%s\r\n" % (smtplib.quoteaddr(from_addr), mail_suffix)]
+        commands.extend(
+            "rcpt to:%s%s\r\n" % (smtplib.quoteaddr(addr), rcpt_suffix) for addr in to_addrs
+        )
+        commands.append("data\r\n")
+        self.send(''.join(commands))
+
+        # 响应与命令一一对应，必须全部读完才能继续使用连接
+        mail_code, mail_resp = self.getreply()
+        senderrs = {}
+        closing = mail_code == 421
+        for addr in to_addrs:
+            code, resp = self.getreply()
+            if code != 250 and code != 251:
+                senderrs[addr] = (code, resp)
+            closing = closing or code == 421
+        data_code, data_resp = self.getreply()
+
+        failed = mail_code != 250 or len(senderrs) == len(to_addrs)
+        if data_code == 354 and failed:
+            # 服务器仍进入了数据阶段，发送空正文结束本次事务
+            self.send(b".\r\n")
+            self.getreply()
+        if closing or data_code == 421:
+            self.close()
+        elif failed or data_code != 354:
+            self._rset()
+
+        if mail_code != 250:
+            raise smtplib.SMTPSenderRefused(mail_code, mail_resp, from_addr)
+        if len(senderrs) == len(to_addrs):
+            raise smtplib.SMTPRecipientsRefused(senderrs)
+        if data_code != 354:
+            raise smtplib.SMTPDataError(data_code, data_resp)
+
+        body = _LEADING_DOT.sub(b'..', msg)
+        if body[-2:] != b"\r\n":
+            body += b"\r\n"
+        self.send(body + b".\r\n")
+        code, resp = self.getreply()
+        if code != 250:
+            if code == 421:
+                self.close()
+            else:
+                self._rset()
+            raise smtplib.SMTPDataError(code, resp)
+        return senderrs
+
+
+# SMTP连接池：(服务器, 端口, 发件邮箱, 授权码) -> (空闲连接队列, 连接数上限)，
+# 同一配置的所有 QQEmailService 实例共用；空闲连接以 (连接, 已发送数, 创建时间) 保存（后进先出）
+_SMTP_POOLS: Dict[
+    Tuple[str, str, str, str],
+    Tuple["queue.LifoQueue[Tuple[smtplib.SMTP, int, float]]", threading.BoundedSemaphore]
+] = {}
+_smtp_pools_lock = threading.Lock()
+
+
+def _get_smtp_pool(
+    smtp_config: Dict[str, Any]
+) -> Tuple["queue.LifoQueue[Tuple[smtplib.SMTP, int, float]]", threading.BoundedSemaphore]:
+    """获取 SMTP 配置对应的连接池，不存在时按配置的连接数上限创建"""
+    key = (
+        smtp_config['smtp_server'],
+        str(smtp_config['smtp_port']),
+        smtp_config['sender_email'],
+        smtp_config['auth_code'],
+    )
+    with _smtp_pools_lock:
+        pool = _SMTP_POOLS.get(key)
+        if pool is None:
+            pool = _SMTP_POOLS[key] = (
+                queue.LifoQueue(),
+                threading.BoundedSemaphore(smtp_config['pool_size']),
+            )
+    return pool
+
+
+def _discard_smtp(smtp: smtplib.SMTP, graceful: bool = False) -> None:
+    """关闭并丢弃一个SMTP连接；graceful 为 True 时先发送 QUIT"""
+    try:
+        if graceful:
+            smtp.quit()
+        else:
+            smtp.close()
+    except Exception:
+        pass
+
+
+def _drain_smtp_pool(idle: "queue.LifoQueue[Tuple[smtplib.SMTP, int, float]]") -> None:
+    """关闭连接池中的全部空闲连接"""
+    while True:
+        try:
+            smtp, _, _ = idle.get_nowait()
+        except queue.Empty:
+            return
+        _discard_smtp(smtp, graceful=True)
+
+
+@atexit.register
+def _close_smtp_pools() -> None:
+    """进程退出时关闭所有连接池中的空闲连接"""
+    with _smtp_pools_lock:
+        pools = list(_SMTP_POOLS.values())
+    for idle, _ in pools:
+        _drain_smtp_pool(idle)
+
+
 class QQEmailService:
     """QQ邮件发送服务"""
 
@@ -39,22 +290,22 @@ class QQEmailService:
         self.smtp_config = self.email_config.get_smtp_config()
         self.sender_info = self.email_config.get_sender_info()
 
+        # 同一SMTP配置的所有实例共用模块级连接池，多个线程可并行发送；
+        # 连接发送达到上限或存活过久后轮换，避免被服务器限流或断开
+        self._idle_smtp, self._smtp_slots = _get_smtp_pool(self.smtp_config)
+
     def _validate_email(self, email: str) -> bool:
         """验证邮箱地址格式"""
-        try:
-            # 只验证格式，不检查DNS可投递性
-            validate_email(email, check_deliverability=False)
-            return True
-        except EmailNotValidError:
-            return False
+        return _validate_email_cached(email)
 
     def _detect_file_encoding(self, file_path: str) -> str:
         """检测文件编码"""
         try:
-            with open(file_path, 'rb') as f:
-                raw_data = f.read()
-                result = chardet.detect(raw_data)
-                return result['encoding'] or 'utf-8'
+            # 样本一次性读出，无缓冲读取只需一次 read 系统调用
+            with open(file_path, 'rb', buffering=0) as f:
+                raw_data = f.read(_ENCODING_SAMPLE_SIZE)
+            result = _detect_charset(raw_data)
+            return result['encoding'] or 'utf-8'
         except Exception:
             return 'utf-8'
 
@@ -62,7 +313,7 @@ class QQEmailService:
         """创建SMTP连接"""
         try:
             # 创建SMTP连接
-            smtp = smtplib.SMTP(self.smtp_config['smtp_server'], self.smtp_config['smtp_port'])
+            smtp = _PipeliningSMTP(self.smtp_config['smtp_server'], self.smtp_config['smtp_port'])
 
             # 设置调试级别
             smtp.set_debuglevel(0)
@@ -86,6 +337,74 @@ class QQEmailService:
             logger.error(f"创建SMTP连接时发生未知错误: {str(e)}")
             raise
 
+    def _take_idle_smtp(self) -> Optional[Tuple[smtplib.SMTP, int, float]]:
+        """
+        从连接池取出一个可用的空闲连接
+
+        超过存活时间的连接直接丢弃，其余先用 NOOP 探活。
+
+        Returns:
+            Optional[Tuple]: (连接, 已发送数, 创建时间)，没有可用连接时返回 None
+        """
+        max_age = self.smtp_config['max_connection_age']
+        while True:
+            try:
+                smtp, sent, created = self._idle_smtp.get_nowait()
+            except queue.Empty:
+                return None
+
+            if time.monotonic() - created > max_age:
+                _discard_smtp(smtp, graceful=True)
+                continue
+            try:
+                if smtp.noop()[0] == 250:
+                    return smtp, sent, created
+            except (smtplib.SMTPException, OSError):
+                pass
+            _discard_smtp(smtp)
+
+    @contextmanager
+    def _acquire_smtp(self) -> Iterator[smtplib.SMTP]:
+        """
+        从连接池借出一个SMTP连接，用完自动归还；连接数达到上限时等待
+
+        使用过程中出错时丢弃该连接（连接状态不再可信），下次借出时重新建立。
+
+        Yields:
+            smtplib.SMTP: 独占使用的已登录连接
+        """
+        self._smtp_slots.acquire()
+        try:
+            entry = self._take_idle_smtp()
+            if entry is None:
+                entry = (self._create_smtp_connection(), 0, time.monotonic())
+            smtp, sent, created = entry
+
+            try:
+                yield smtp
+            except Exception:
+                _discard_smtp(smtp)
+                raise
+
+            sent += 1
+            if (
+                sent >= self.smtp_config['max_messages_per_connection']
+                or time.monotonic() - created > self.smtp_config['max_connection_age']
+            ):
+                _discard_smtp(smtp, graceful=True)
+            else:
+                self._idle_smtp.put((smtp, sent, created))
+        finally:
+            self._smtp_slots.release()
+
+    def close(self) -> None:
+        """
+        关闭连接池中的全部空闲连接（正在使用的连接归还后按常规规则处理）
+
+        连接池由同一配置的所有实例共用，关闭后其他实例下次发送时会重新建立连接。
+        """
+        _drain_smtp_pool(self._idle_smtp)
+
     def _add_attachments(self, msg: MIMEMultipart, attachment_paths: List[str]) -> None:
         """添加附件到邮件"""
         for file_path in attachment_paths:
@@ -95,17 +414,16 @@ class QQEmailService:
                     logger.error(f"附件文件不存在: {file_path}")
                     raise FileNotFoundError(f"附件文件不存在: {file_path}")
 
-                # 检测文件编码
-                encoding = self._detect_file_encoding(file_path)
-
                 # 根据文件类型创建附件
-                content_type = self._get_content_type(path_obj.suffix)
+                maintype, subtype = self._get_content_type(path_obj.suffix)
 
-                with open(file_path, 'rb') as attachment:
-                    part = MIMEBase(*content_type.split('/'))
-                    part.set_payload(attachment.read())
+                part = MIMEBase(maintype, subtype)
+                part.set_payload(_encode_file_base64(file_path))
+                part['Content-Transfer-Encoding'] = 'base64'
 
-                encoders.encode_base64(part)
+                # 文本附件在 Content-Type 中标明字符集，便于收件端正确显示；二进制附件无需检测
+                if maintype == 'text':
+                    part.set_param('charset', self._detect_file_encoding(file_path))
 
                 # 添加附件头
                 filename = path_obj.name
@@ -130,27 +448,9 @@ class QQEmailService:
                 logger.error(f"添加附件失败 {file_path}: {str(e)}")
                 raise
 
-    def _get_content_type(self, file_extension: str) -> str:
-        """根据文件扩展名获取Content-Type"""
-        extension = file_extension.lower()
-        content_types = {
-            '.txt': 'text/plain',
-            '.pdf': 'application/pdf',
-            '.doc': 'application/msword',
-            '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-            '.xls': 'application/vnd.ms-excel',
-            '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.gif': 'image/gif',
-            '.zip': 'application/zip',
-            '.rar': 'application/x-rar-compressed',
-            '.json': 'application/json',
-            '.xml': 'application/xml',
-            '.csv': 'text/csv',
-        }
-        return content_types.get(extension, 'application/octet-stream')
+    def _get_content_type(self, file_extension: str) -> Tuple[str, str]:
+        """根据文件扩展名获取Content-Type，返回 (maintype, subtype)"""
+        return _CONTENT_TYPE_PARTS.get(file_extension.lower(), _DEFAULT_CONTENT_TYPE_PARTS)
 
     def send_email(
         self,
@@ -181,7 +481,6 @@ class QQEmailService:
         Returns:
             Dict: 发送结果，包含success、message、message_id等字段
         """
-        smtp = None
         try:
             # 参数验证和标准化
             if isinstance(to_emails, str):
@@ -195,11 +494,13 @@ class QQEmailService:
             bcc_emails = bcc_emails or []
             attachment_paths = attachment_paths or []
 
-            # 验证邮箱格式
-            all_emails = to_emails + cc_emails + bcc_emails
-            for email in all_emails:
-                if not self._validate_email(email):
-                    raise ValueError(f"无效的邮箱地址: {email}")
+            # 验证邮箱格式：去重后由 map 在 C 层逐个调用带缓存的校验函数，
+            # 重复地址命中缓存时不进入 Python 帧；失败时再找出具体的无效地址
+            all_recipients = to_emails + cc_emails + bcc_emails
+            unique_emails = dict.fromkeys(all_recipients)
+            if not all(map(_validate_email_cached, unique_emails)):
+                invalid = next(e for e in unique_emails if not _validate_email_cached(e))
+                raise ValueError(f"无效的邮箱地址: {invalid}")
 
             # 创建邮件消息
             msg = MIMEMultipart()
@@ -222,14 +523,9 @@ class QQEmailService:
             if attachment_paths:
                 self._add_attachments(msg, attachment_paths)
 
-            # 创建SMTP连接并发送
-            smtp = self._create_smtp_connection()
-
-            # 合并所有收件人
-            all_recipients = to_emails + cc_emails + bcc_emails
-
-            # 发送邮件
-            result = smtp.send_message(msg, to_addrs=all_recipients)
+            # 从连接池借出连接发送邮件
+            with self._acquire_smtp() as smtp:
+                result = smtp.send_message(msg, to_addrs=all_recipients)
 
             # QQ邮箱返回的格式是: {'ok': '1 Message accepted for delivery'}
             message_id = result.get('ok', '') if isinstance(result, dict) else str(result)
@@ -286,12 +582,6 @@ class QQEmailService:
                 'message': f'发送失败: {str(e)}',
                 'error_type': 'unknown_error'
             }
-        finally:
-            if smtp:
-                try:
-                    smtp.quit()
-                except Exception:
-                    pass
 
     def send_simple_email(self, to_email: str, subject: str, content: str) -> Dict[str, Any]:
         """
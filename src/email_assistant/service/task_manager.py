@@ -13,6 +13,7 @@ from ..models.scheduler_task_model import (
     TaskStatus
 )
 from .scheduler_service import SchedulerService, EmailTask
+from .scheduler_service import scheduler_service as default_scheduler_service
 
 # 配置日志
 logging.basicConfig(
@@ -57,7 +58,7 @@ class TaskManager:
             return
 
         self.task_model = task_model or SchedulerTaskModel()
-        self.scheduler_service = scheduler_service or SchedulerService()
+        self.scheduler_service = scheduler_service or default_scheduler_service
         self._initialized = True
 
         logger.info("任务管理器初始化完成")